@@ -3,76 +3,85 @@ Author: L. Flygare
 Description: demonstrate using built-in methods and other loops with various data structures to manipulate the data
 """
 
+import io
 import random
+import sys
+
+#collect all output in one buffer and write it to the terminal once at the end instead of once per print
+out = io.StringIO()
 
 #creating a tuple in a normal order and a list with the same elements in the reversed order
-print("\n***Build Data Structures***")
+print("\n***Build Data Structures***", file=out)
 aTuple = ("pangolin", "axolotl", "okapi", "quokka", "narwhal", "kakapo", "fossa", "tarsier", "shoebill", "aye-aye")
 bList = list(reversed(aTuple))
 idTuple = id(aTuple)
 idList = id(bList)
 
 #printing both to show the data structures with the elements in their starting orders before manipulating them
-print("Tuple (normal order): ", aTuple)
-print("List (reverse order): ", bList)
+print("Tuple (normal order): ", aTuple, file=out)
+print("List (reverse order): ", bList, file=out)
 
 #print the 3rd element of each structure
-print("\n***Print 3rd Element***")
-print("Tuple (3rd element): ", aTuple[2])
-print("List (3rd element): ", bList[2])
+print("\n***Print 3rd Element***", file=out)
+print("Tuple (3rd element): ", aTuple[2], file=out)
+print("List (3rd element): ", bList[2], file=out)
 
 #print elements in a random order
-randTuple = random.sample(aTuple, k=len(aTuple))    #creates a randomized view despite tuples being immutable
+randTuple = list(aTuple)    #one list copy of the tuple since tuples are immutable and can't be shuffled directly
+random.shuffle(randTuple)   #in-place shuffle of that copy
 randList = bList[:] #shallow copy so I can preserve original order of the list when using random.shuffle
 random.shuffle(randList)    #shuffle copy, not original - could have used random.sample but wanted to mess around
 
-print("\n*** Print Elements Randomly***")
-print("Tuple (randomized order using alternate tuple): ", randTuple)
-print("ID aTuple: ", idTuple)
-print("ID randTuple: ", id(randTuple))
-print("List (randomized order using alternate list to preserve original list order): ", randList)
-print("ID bList: ", idList)
-print("ID randList: ", id(randList))
+print("\n*** Print Elements Randomly***", file=out)
+print("Tuple (randomized order using alternate tuple): ", randTuple, file=out)
+print("ID aTuple: ", idTuple, file=out)
+print("ID randTuple: ", id(randTuple), file=out)
+print("List (randomized order using alternate list to preserve original list order): ", randList, file=out)
+print("ID bList: ", idList, file=out)
+print("ID randList: ", id(randList), file=out)
 
 #add an eleventh element to the end of both
 aTuple = aTuple + ("Maned Wolf", )  #create new tuple with same name to circumvent immutabilty and add a new element
 bList.append("Maned Wolf")
 
-print("\n***Add 11th Element to End***")
-print("Tuple (new tuple to add element): ", aTuple)
-print("ID original aTuple: ", idTuple)
-print("ID new aTuple: ", id(aTuple))
-print("List (same list, appended element): ", bList)
-print("ID original bList: ", idList)
-print("ID new bList: ", id(bList))
+print("\n***Add 11th Element to End***", file=out)
+print("Tuple (new tuple to add element): ", aTuple, file=out)
+print("ID original aTuple: ", idTuple, file=out)
+print("ID new aTuple: ", id(aTuple), file=out)
+print("List (same list, appended element): ", bList, file=out)
+print("ID original bList: ", idList, file=out)
+print("ID new bList: ", id(bList), file=out)
 
 #remove the first element
 aTuple = aTuple[1:] #new tuple starting with index position one to omit first item
 bList.pop(0)
 
-print("\n***Remove 1st Element***")
-print("Tuple (new tuple to remove element): ", aTuple)
-print("ID original aTuple: ", idTuple)
-print("ID new aTuple: ", id(aTuple))
-print("List (same list, popped element): ", bList)
-print("ID original bList: ", idList)
-print("ID new bList: ", id(bList))
+print("\n***Remove 1st Element***", file=out)
+print("Tuple (new tuple to remove element): ", aTuple, file=out)
+print("ID original aTuple: ", idTuple, file=out)
+print("ID new aTuple: ", id(aTuple), file=out)
+print("List (same list, popped element): ", bList, file=out)
+print("ID original bList: ", idList, file=out)
+print("ID new bList: ", id(bList), file=out)
 
 #remove same element from both structures
 to_remove = "okapi"
 
-tempList = list(aTuple) #once again have to work around immutability of tuples and cast it to a list for easier manipulation
-if to_remove in tempList:
-    tempList.remove(to_remove)
-aTuple = tuple(tempList)    #convert back from list to a tuple
+#once again have to work around immutability of tuples, build the new tuple in one pass skipping the element (all names are unique)
+aTuple = tuple(x for x in aTuple if x != to_remove)
 
-if to_remove in bList:
+#remove() already searches the list, so just try it instead of checking with 'in' first (which would scan twice)
+try:
     bList.remove(to_remove)
+except ValueError:
+    pass
+
+print("\n***Remove Same Element From Both Structures***", file=out)
+print("Tuple (new tuple without okapi): ", aTuple, file=out)
+print("ID original aTuple: ", idTuple, file=out)
+print("ID new aTuple: ", id(aTuple), file=out)
+print("List (same list without okapi): ", bList, file=out)
+print("ID original bList: ", idList, file=out)
+print("ID new bList: ", id(bList), file=out)
 
-print("\n***Remove Same Element From Both Structures***")
-print("Tuple (new tuple without okapi): ", aTuple)
-print("ID original aTuple: ", idTuple)
-print("ID new aTuple: ", id(aTuple))
-print("List (same list without okapi): ", bList)
-print("ID original bList: ", idList)
-print("ID new bList: ", id(bList))
\ No newline at end of file
+sys.stdout.write(out.getvalue())
@@ -1,18 +1,27 @@
-import re, os
-
-FIELD_RE = re.compile(r"\s*([^:;]+)\s*:\s*([^;]+)\s*(?:;|$)")
+import os
 
 def parse_block_text(text):
-    return {m.group(1).strip(): m.group(2).strip() for m in FIELD_RE.finditer(text)}
+    # blocks are flat "Key: value; Key: value" lines, so plain splits do what a regex would without building match objects
+    d={}
+    for part in text.split(';'):
+        k,sep,v=part.partition(':')
+        k=k.strip()
+        if sep and k: d[k]=v.strip()
+    return d
+
+def _blocks(path):
+    # blank-line separated blocks, each stripped once
+    with open(path) as f: text=f.read()
+    for b in text.split('\n\n'):
+        b=b.strip()
+        if b: yield b
 
 def parse_moves_file(path):
-    with open(path) as f: blocks=[b.strip() for b in f.read().split('\n\n') if b.strip()]
-    return [parse_block_text(b) for b in blocks]
+    return [parse_block_text(b) for b in _blocks(path)]
 
 def parse_creatures_file(path):
-    with open(path) as f: blocks=[b.strip() for b in f.read().split('\n\n') if b.strip()]
     creatures=[]
-    for b in blocks:
+    for b in _blocks(path):
         d=parse_block_text(b)
         if "Moves" in d: d["Moves"]=[m.strip() for m in d["Moves"].split(",")]
         creatures.append(d)
@@ -1,8 +1,10 @@
-import random, os, datetime
+import random, os, time
+from collections import deque
 
 LOGS_DIR = "logs"
 
 class Move:
+    __slots__ = ("name","power","accuracy","priority","category","effect")
     def __init__(self, d):
         self.name = d.get("Name")
         self.power = int(d.get("Power", 0))
@@ -10,21 +12,35 @@ class Move:
         self.priority = int(d.get("Priority", 0))
         self.category = d.get("Category", "Physical")
         self.effect = d.get("Effect", "None")
+    # same keys Move() reads, so saved teams load back with their real move data
+    def as_dict(self): return {"Name":self.name,"Power":self.power,"Accuracy":self.accuracy,"Priority":self.priority,"Category":self.category,"Effect":self.effect}
+
+# moves are never mutated by the engine, so identical move definitions can share one instance across creatures
+_MOVE_CACHE = {}
+def _get_move(d):
+    key = tuple(d.items())
+    m = _MOVE_CACHE.get(key)
+    if m is None: m = _MOVE_CACHE[key] = Move(d)
+    return m
 
 class CreatureInstance:
+    __slots__ = ("name","max_hp","hp","atk","defe","spd","status","moves","_menu","fainted")
     def __init__(self, name, hp, atk, defe, spd, moves):
         self.name, self.max_hp, self.hp = name, int(hp), int(hp)
         self.atk, self.defe, self.spd = int(atk), int(defe), int(spd)
         self.status = None
-        self.moves = [Move(m) if isinstance(m, dict) else Move({"Name": m, "Power":40, "Accuracy":100}) for m in moves]
+        # kept in sync by the engine wherever hp drops, so checks are a plain attribute read
+        self.fainted = self.hp <= 0
+        self.moves = [_get_move(m if isinstance(m, dict) else {"Name": m, "Power":40, "Accuracy":100}) for m in moves]
+        # moves never change after creation, so the menu text is built once
+        self._menu = "\n".join(f" {i+1}. {m.name} (Pow {m.power}, Acc {m.accuracy})" for i,m in enumerate(self.moves))
 
     @classmethod
     def from_dict(cls, d):
         return cls(d.get("Name"), d.get("HP",10), d.get("Attack",10), d.get("Defense",10), d.get("Speed",10), d.get("Moves", []))
 
     def choose_move_index(self):
-        print(f"\n{self.name} HP: {self.hp}/{self.max_hp} — choose move:")
-        for i,m in enumerate(self.moves): print(f" {i+1}. {m.name} (Pow {m.power}, Acc {m.accuracy})")
+        print(f"\n{self.name} HP: {self.hp}/{self.max_hp} — choose move:\n{self._menu}")
         while True:
             try:
                 i = int(input("Move #: ")) - 1
@@ -32,61 +48,106 @@ class CreatureInstance:
             except: pass
             print("Invalid.")
 
-    def is_fainted(self): return self.hp <= 0
-    def to_dict(self): return {"Name":self.name,"HP":self.hp,"Attack":self.atk,"Defense":self.defe,"Speed":self.spd,"Moves":[m.__dict__ for m in self.moves]}
+    def is_fainted(self): return self.fainted
+    def to_dict(self): return {"Name":self.name,"HP":self.hp,"Attack":self.atk,"Defense":self.defe,"Speed":self.spd,"Moves":[m.as_dict() for m in self.moves]}
+
+def _damage_kernel(atk, dfn, power, crit_rate, r1, r2):
+    # pure scalar damage formula; r1 rolls the crit, r2 in [0,1) maps onto the 0.85-1.0 variance
+    base = ((2*50/5+2)*power*(atk/dfn))/50+2
+    if r1<crit_rate: base*=1.5
+    return int(base*(0.85+0.15*r2))
 
 class BattleEngine:
     CRIT_RATE = 0.0625
-    def __init__(self, team_a, team_b):
+    def __init__(self, team_a, team_b, verbose=False, seed=None, log_path=None, max_lines=None):
         self.team_a, self.team_b, self.turn = team_a, team_b, 0
-        os.makedirs(LOGS_DIR, exist_ok=True)
-        self.log_path = os.path.join(LOGS_DIR, f"battle_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-        self.log_lines = []
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        # headless engines with no explicit path stay in memory and never touch the filesystem
+        if log_path is None and verbose:
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            log_path = os.path.join(LOGS_DIR, f"battle_{time.strftime('%Y%m%d_%H%M%S')}.log")
+        self.log_path = log_path
+        # bytes for the saved file, only filled when there is a file to save to so headless runs stay bounded
+        self.log_buf = bytearray()
+        # line view for displays; max_lines keeps only a rolling tail while log_buf still holds the full file
+        self.log_lines = deque(maxlen=max_lines) if max_lines else []
+        # only creatures that have been burned need the end-of-turn tick
+        self._burned = []
+        self._ai = self._bi = 0
 
-    def log(self, msg): self.log_lines.append(msg); print(msg)
+    def log(self, msg):
+        if self.log_path is not None: self.log_buf += msg.encode() + b"\n"
+        self.log_lines.append(msg)
+        if self.verbose: print(msg)
     def save_log(self):
-        with open(self.log_path,'w') as f: f.write('\n'.join(self.log_lines))
-        print(f"Battle log saved to {self.log_path}")
+        if self.log_path is None: return
+        # log is already one contiguous buffer, so hand it straight to the fd and skip the io layer
+        fd = os.open(self.log_path, os.O_WRONLY|os.O_CREAT|os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(self.log_buf)
+            while view: view = view[os.write(fd, view):]
+        finally: os.close(fd)
+        if self.verbose: print(f"Battle log saved to {self.log_path}")
 
     def damage_calc(self,a,d,m):
-        base = ((2*50/5+2)*m.power*(a.atk/d.defe))/50+2
-        crit = random.random()<self.CRIT_RATE
-        if crit: base*=1.5
-        return int(base*random.uniform(0.85,1)), crit
+        r1 = self._rng.random()
+        return _damage_kernel(a.atk,d.defe,m.power,self.CRIT_RATE,r1,self._rng.random()), r1<self.CRIT_RATE
+
+    def damage_calc_batch(self,atk,dfn,pwr):
+        # same formula as damage_calc over parallel stat sequences, one pass with hoisted lookups
+        rnd,cr,k=self._rng.random,self.CRIT_RATE,_damage_kernel
+        r1s=[rnd() for _ in pwr]
+        return [k(x,y,p,cr,r1,rnd()) for x,y,p,r1 in zip(atk,dfn,pwr,r1s)], [r1<cr for r1 in r1s]
+
+    def specialize(self,a,d):
+        # fold the fixed matchup into one constant so repeated calls (e.g. trying every move) only do power/roll math
+        k,cr=(2*50/5+2)*a.atk/d.defe/50,self.CRIT_RATE
+        return lambda power,r1,r2: int((k*power+2)*(1.5 if r1<cr else 1.0)*(0.85+0.15*r2))
 
     def get_active(self,t): return next((c for c in t if not c.is_fainted()), None)
     def alive(self,t): return any(not c.is_fainted() for c in t)
+    def _advance_active(self,t,i):
+        # fainted creatures never come back, so only walk forward from the current active slot
+        while i<len(t) and t[i].fainted: i+=1
+        return i
 
     def apply_status(self,creature):
-        if creature.status == "Paralyzed" and random.random()<0.25:
+        if creature.status == "Paralyzed" and self._rng.random()<0.25:
             self.log(f"{creature.name} is paralyzed and can't move!")
             return False
         return True
 
     def run_cli_battle(self):
         self.log("Battle start!")
-        while self.alive(self.team_a) and self.alive(self.team_b):
+        while True:
+            self._ai,self._bi=self._advance_active(self.team_a,self._ai),self._advance_active(self.team_b,self._bi)
+            if self._ai>=len(self.team_a) or self._bi>=len(self.team_b): break
             self.turn+=1
-            a,b=self.get_active(self.team_a),self.get_active(self.team_b)
+            a,b=self.team_a[self._ai],self.team_b[self._bi]
             self.log(f"--- Turn {self.turn}: {a.name} vs {b.name} ---")
             m1=a.moves[a.choose_move_index()]
-            m2=b.moves[random.randrange(len(b.moves))]
-            order=sorted([(a,m1),(b,m2)],key=lambda x:(x[1].priority,x[0].spd),reverse=True)
+            m2=b.moves[self._rng.randrange(len(b.moves))]
+            order=((a,m1),(b,m2)) if (m1.priority,a.spd)>=(m2.priority,b.spd) else ((b,m2),(a,m1))
             for actor,move in order:
-                if actor.is_fainted(): continue
+                if actor.fainted: continue
                 target=b if actor is a else a
                 if not self.apply_status(actor): continue
-                if random.randint(1,100)>move.accuracy:
+                if self._rng.randint(1,100)>move.accuracy:
                     self.log(f"{actor.name}'s {move.name} missed!"); continue
                 dmg,crit=self.damage_calc(actor,target,move)
                 target.hp=max(0,target.hp-dmg)
+                if target.hp==0: target.fainted=True
                 txt=f"{actor.name} used {move.name}! {'CRITICAL! ' if crit else ''}{target.name} took {dmg} dmg ({target.hp}/{target.max_hp})."
                 self.log(txt)
-                if move.effect=="BurnChance" and random.random()<0.1: target.status="Burned"; self.log(f"{target.name} was burned!")
-                if move.effect=="ParalyzeChance" and random.random()<0.1: target.status="Paralyzed"; self.log(f"{target.name} was paralyzed!")
-                if target.is_fainted(): self.log(f"{target.name} fainted!"); break
-            for t in (self.team_a+self.team_b):
-                if t.status=="Burned" and not t.is_fainted():
+                if move.effect=="BurnChance" and self._rng.random()<0.1:
+                    target.status="Burned"; self.log(f"{target.name} was burned!")
+                    if target not in self._burned: self._burned.append(target)
+                if move.effect=="ParalyzeChance" and self._rng.random()<0.1: target.status="Paralyzed"; self.log(f"{target.name} was paralyzed!")
+                if target.fainted: self.log(f"{target.name} fainted!"); break
+            for t in self._burned:
+                if t.status=="Burned" and not t.fainted:
                     burn_dmg=max(1,int(t.max_hp*0.05));t.hp-=burn_dmg;self.log(f"{t.name} is hurt by its burn ({t.hp}/{t.max_hp}).")
-        self.log("You won!" if self.alive(self.team_a) else "You lost!")
+                    if t.hp<=0: t.fainted=True
+        self.log("You won!" if self._ai<len(self.team_a) else "You lost!")
         self.save_log()
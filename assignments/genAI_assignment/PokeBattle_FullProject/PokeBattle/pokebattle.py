@@ -2,19 +2,31 @@
 import json, os, random, datetime
 from poke_engine import BattleEngine, CreatureInstance
 from data_parser import parse_creatures_file, parse_moves_file
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CONFIG_DIR = "configs"
 SAVES_DIR = "saves"
 LOGS_DIR = "logs"
 
+def dump_json(obj):
+    # save files are written as one bytes blob; orjson when available, stdlib json otherwise
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2) if orjson else json.dumps(obj, indent=2).encode()
+
+def load_json(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
 def ensure_dirs():
     for d in (SAVES_DIR, LOGS_DIR):
         os.makedirs(d, exist_ok=True)
 
 def pick_team(creatures, prompt="Pick 3 creatures by number (comma separated): "):
-    print("\nAvailable creatures:")
-    for i, c in enumerate(creatures):
-        print(f"{i+1}. {c['Name']} (HP={c.get('HP')}, Atk={c.get('Attack')}, Def={c.get('Defense')}, Spd={c.get('Speed')}) Moves: {', '.join(c.get('Moves', []))}")
+    menu = "\nAvailable creatures:\n" + "\n".join(
+        f"{i+1}. {c['Name']} (HP={c.get('HP')}, Atk={c.get('Attack')}, Def={c.get('Defense')}, Spd={c.get('Speed')}) Moves: {', '.join(c.get('Moves', []))}"
+        for i, c in enumerate(creatures))
+    print(menu)
     while True:
         choice = input(prompt).strip()
         try:
@@ -34,7 +46,8 @@ def main():
 
     action = input("Start (N)ew battle or (L)oad saved team? [N/L]: ").strip().lower()
     if action == "l":
-        saves = [f for f in os.listdir(SAVES_DIR) if f.endswith(".json")]
+        with os.scandir(SAVES_DIR) as it:
+            saves = sorted(e.name for e in it if e.name.endswith(".json") and e.is_file())
         if not saves:
             print("No saves found. Starting new battle.")
             action = "n"
@@ -43,16 +56,16 @@ def main():
             for i, s in enumerate(saves):
                 print(f"{i+1}. {s}")
             idx = int(input("Pick save number: ").strip()) - 1
-            with open(os.path.join(SAVES_DIR, saves[idx]), "r") as fh:
-                saved = json.load(fh)
+            with open(os.path.join(SAVES_DIR, saves[idx]), "rb") as fh:
+                saved = load_json(fh.read())
             team = [CreatureInstance.from_dict(c) for c in saved["team"]]
     if action != "l":
         team = pick_team(creatures)
         if input("Save this team for later? [y/N]: ").strip().lower() == "y":
             name = input("Save filename (no extension): ").strip() or "team"
             savepath = os.path.join(SAVES_DIR, f"{name}.json")
-            with open(savepath, "w") as fh:
-                json.dump({"team": [c.to_dict() for c in team], "created": str(datetime.datetime.now())}, fh, indent=2)
+            with open(savepath, "wb") as fh:
+                fh.write(dump_json({"team": [c.to_dict() for c in team], "created": str(datetime.datetime.now())}))
             print(f"Saved to {savepath}")
 
     opponent = [CreatureInstance.from_dict(c) for c in random.sample(creatures, k=min(3, len(creatures)))]
@@ -61,7 +74,7 @@ def main():
     print("\nOpponent team:")
     for c in opponent: print(" -", c.name)
 
-    engine = BattleEngine(team, opponent)
+    engine = BattleEngine(team, opponent, verbose=True)
     engine.run_cli_battle()
 
 if __name__ == "__main__":
@@ -49,11 +49,15 @@ class InputBox(QDialog):
 
     def get_text(self):
         return self.text_edit.toPlainText().strip()
+
+    def clear_text(self):
+        """empty the text box so the same dialog can be shown again"""
+        self.text_edit.clear()
     
 
 class ConfirmBox(QDialog):
     """dialog box to confirm user input"""
-    def __init__(self, text, start_position = None, parent = None):
+    def __init__(self, text = "", start_position = None, parent = None):
         super().__init__(parent)
 
         self.setWindowTitle("Confirm Your Text")
@@ -89,15 +93,25 @@ class ConfirmBox(QDialog):
         if start_position is not None:
             self.move(start_position)
 
+    def set_text(self, text):
+        """swap in new text to confirm so the same dialog can be shown again"""
+        self.text_display.setPlainText(text)
+
     
 def main():
     app = QApplication(sys.argv)
 
     last_position = None
 
+    #build both dialogs once and reuse them on every retry instead of recreating all the widgets each loop
+    input_box = InputBox()
+    confirm_box = ConfirmBox()
+
     while True:
         #asks for input
-        input_box = InputBox(start_position = last_position)
+        input_box.clear_text()
+        if last_position is not None:
+            input_box.move(last_position)
         result = input_box.exec()
 
         #exits if user cancels input
@@ -109,7 +123,8 @@ def main():
         user_text = input_box.get_text()
 
         #show confirmation box
-        confirm_box = ConfirmBox(text = user_text, start_position = last_position)
+        confirm_box.set_text(user_text)
+        confirm_box.move(last_position)
         confirm_result = confirm_box.exec()
 
         #update position with position of current box when closed
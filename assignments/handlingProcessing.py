@@ -3,55 +3,272 @@ Author: L. Flygare
 Description: demonstrate file handling and data processing using a provided log file
 """
 
-import re
+import argparse
+import hashlib
+import json
+import mmap
+import os
+from multiprocessing import Pool, cpu_count
+
+#google-re2 (pip install google-re2) is a drop-in DFA-based replacement for re that doesn't backtrack,
+#use it when it is installed and fall back to the standard library otherwise
+try:
+    import re2 as re
+except ImportError:
+    import re
 
 #easy to swap file name in one spot if this needs to be used for a different file but same purpose
 LOG_PATH = "assignments/access.log" 
 
-#open and read the log file into list
-def read_file_to_list(path):
-    #try and except with errors caught and returned
+#parsed results of whole-file runs are saved here so a log that hasn't changed is never parsed twice
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "handlingProcessing")
+#part of every cache key, bump it whenever _scan or _pack_ip change what gets extracted so old results aren't reused
+CACHE_VERSION = 3
+
+#compiled once at import instead of every time the log is parsed
+#\b word boundary, ?: groups things together without making separate match groups,
+#\d{1,3} match 1-3 digits/0-999, {3} repeats 3x
+#bytes pattern so log lines never have to be decoded, only the unique IPs are decoded when printed
+_IP_RE = re.compile(rb"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+
+#map the log file into memory and yield it one line at a time so the whole file is never copied into python at once
+#lines come out as raw bytes, nothing in the scan needs them decoded
+#the OS pages the file in as it is read instead of going through python's buffered file reader
+def iter_file(path):
+    #try and except with errors caught and reported, yields nothing on error
     try:
-        with open(path) as in_file:
-            in_data = in_file.readlines()
-        return in_data
+        with open(path, "rb") as in_file:
+            #mmap can't map an empty file
+            if os.fstat(in_file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                #the file is read front to back once, tell the kernel so it reads ahead aggressively on a cold cache
+                #(MADV_SEQUENTIAL isn't available on every platform, e.g. windows)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                lines = iter(mm.readline, b"")
+                yield from (_split_cr(lines) if mm.find(b"\r") != -1 else lines)
     except FileNotFoundError:
         print(f"Error: '{path}' was not found")
-        return[]
     #non-file not found errors. will return error code to user like no file permissions
     except OSError as error:
         print(f"OS error while reading file '{path}': {error}")
-        return[]
-    
-#return only lines not containing botpoke in them. lines with botpoke will be ignored
-def remove_botpoke(entries):
-    return [line for line in entries if "BotPoke" not in line]
+
+#mm.readline only splits on b"\n", but lines can also end in a bare b"\r" (old mac style logs),
+#split those the same way read_tail's splitlines() and text mode file reading do
+#the b"\r" check only runs for files that have one, plain b"\n" logs go through untouched
+def _split_cr(lines):
+    for line in lines:
+        if b"\r" in line:
+            yield from line.splitlines()
+        else:
+            yield line
+
+#only read the last nbytes of the log (like the linux 'tail' command) for when just the recent entries matter
+#skips reading the whole file, big difference on a large log that keeps growing
+def read_tail(path, nbytes=1 << 20):
+    #same error handling as iter_file
+    try:
+        with open(path, "rb") as in_file:
+            size = os.fstat(in_file.fileno()).st_size
+            start = max(0, size - nbytes)
+            #start one byte early so it can be seen whether start lands right after a newline
+            in_file.seek(max(0, start - 1))
+            lines = in_file.read().splitlines()
+    except FileNotFoundError:
+        print(f"Error: '{path}' was not found")
+        return []
+    except OSError as error:
+        print(f"OS error while reading file '{path}': {error}")
+        return []
+    #if reading started partway into the file drop everything up to the first newline,
+    #that's the cut off part of a line (or just an empty piece when start was already at the beginning of a line)
+    if start > 0:
+        lines = lines[1:]
+    return lines
     
-#regex to return remaining IPs after BotPoke removed
-def get_unique_ips(entries):
-    #\b word boundary, ?: groups things together without making separate match groups,
-    #\d{1,3} match 1-3 digits/0-999, {3} repeats 3x
-    ip_re = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
-    unique = set()  #to only store unique values, no repeat IPs
+#lookup table for every 1-3 digit string the regex can match (including leading zeros like '07') -> its int value
+#a dict lookup per octet is cheaper than calling int() on it
+_OCTET = {f"{i:0{width}d}".encode(): i for width in (1, 2, 3) for i in range(10 ** width)}
+
+#pack the four octets of an IP into one int so the unique IPs can be sorted by plain ints
+#10 bits per octet because the regex allows up to 999 in each spot, so ordering still matches octet by octet
+def _pack_ip(ip):
+    a, b, c, d = ip.split(b".")
+    return (_OCTET[a] << 30) | (_OCTET[b] << 20) | (_OCTET[c] << 10) | _OCTET[d]
+
+#single pass over the log: count every line, skip BotPoke lines, and pull the IP out of the rest
+#replaces separate remove_botpoke/get_unique_ips passes so no filtered copy of the log is ever built
+#returns the unsorted IP dict so results from separate chunks can be merged before sorting
+def _scan(entries):
+    #local aliases skip the attribute lookup on every line
+    match = _IP_RE.match
+    search = _IP_RE.search
+    #IP string -> packed IP, dict keys are unique so no repeat IPs
+    #keyed on the string because '10.0.0.07' and '10.0.0.7' pack to the same int but are different entries
+    packed = {}
+    total = 0
+    remaining = 0
     for line in entries:
-        m = ip_re.search(line)
+        total += 1
+        #lines with botpoke will be ignored
+        if b"BotPoke" in line:
+            continue
+        remaining += 1
+        #a line with no '.' can't hold an IP, cheap substring check before running the regex
+        if b"." not in line:
+            continue
+        #the IP is the first thing on an access log line so try only the start of the line first,
+        #only fall back to scanning the whole line if a line is formatted differently
+        m = match(line) or search(line)
         if m:
-            unique.add(m.group())
-    #IPs sorted for readability adn easy referencing
-    return sorted(unique, key=lambda ip: tuple(map(int, ip.split("."))))
+            ip = m.group()
+            if ip not in packed:
+                packed[ip] = _pack_ip(ip)
+    return total, remaining, packed
 
-def main():
-    all_entries = read_file_to_list(LOG_PATH)
-    print("Total initial log entries: ", len(all_entries))
+#IPs sorted for readability adn easy referencing
+#the sort key is a dict lookup of the packed int instead of splitting and converting every IP
+def _sorted_ips(packed):
+    return sorted(packed, key=packed.__getitem__)
+
+def extract_ips(entries):
+    total, remaining, packed = _scan(entries)
+    return total, remaining, _sorted_ips(packed)
+
+#split the file into n byte ranges that each end right after a newline so no line is cut between two chunks
+def _chunk_bounds(path, n):
+    with open(path, "rb") as in_file, mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        bounds = [0]
+        for i in range(1, n):
+            cut = mm.find(b"\n", max(size * i // n, bounds[-1]))
+            #no newline left means the rest of the file belongs to the last chunk
+            if cut == -1:
+                break
+            if cut + 1 < size:
+                bounds.append(cut + 1)
+        bounds.append(size)
+    return [(path, start, end) for start, end in zip(bounds, bounds[1:])]
+
+#worker side of extract_ips_parallel, each process maps the file itself and scans only its own byte range
+def _scan_chunk(chunk):
+    path, start, end = chunk
+    with open(path, "rb") as in_file, mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+        lines = _chunk_lines(mm, end)
+        return _scan(_split_cr(lines) if mm.find(b"\r", start, end) != -1 else lines)
+
+def _chunk_lines(mm, end):
+    while mm.tell() < end:
+        yield mm.readline()
 
-    filtered = remove_botpoke(all_entries)
+#same result as extract_ips(iter_file(path)) but the log is split into chunks that are scanned on every core,
+#only worth the process startup cost on big logs
+def extract_ips_parallel(path, jobs=None):
+    if jobs is not None and jobs < 0:
+        raise ValueError(f"jobs must be 0 or more, got {jobs}")
+    jobs = jobs or cpu_count()
+    try:
+        if os.path.getsize(path) == 0:
+            return 0, 0, []
+        chunks = _chunk_bounds(path, jobs)
+    except FileNotFoundError:
+        print(f"Error: '{path}' was not found")
+        return 0, 0, []
+    except OSError as error:
+        print(f"OS error while reading file '{path}': {error}")
+        return 0, 0, []
+    with Pool(min(jobs, len(chunks))) as pool:
+        results = pool.map(_scan_chunk, chunks)
+    total = sum(r[0] for r in results)
+    remaining = sum(r[1] for r in results)
+    packed = {}
+    for r in results:
+        packed.update(r[2])
+    return total, remaining, _sorted_ips(packed)
+
+#cache file name comes from the cache version and the log's path, modification time and size
+#so any edit to the log (or to how it is parsed) misses the cache
+#returns None if the log can't be stat'ed, the normal read reports the error in that case
+def _cache_file(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = f"v{CACHE_VERSION}|{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+#a missing or unreadable cache file just means the log gets parsed again
+def load_cached(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as in_file:
+            data = json.load(in_file)
+        return data["total"], data["remaining"], [ip.encode("ascii") for ip in data["ips"]]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_cached(cache_file, result):
+    total, remaining, unique_ips = result
+    data = {"total": total, "remaining": remaining, "ips": [ip.decode("ascii") for ip in unique_ips]}
+    #write to a temp file then rename so a half-written cache file is never read back
+    tmp = cache_file + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as out_file:
+            json.dump(data, out_file)
+        os.replace(tmp, cache_file)
+    except OSError as error:
+        print(f"Could not write cache file '{cache_file}': {error}")
+
+#argparse type for -j, 0 means every core so only negative counts are rejected
+def _job_count(value):
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {jobs}")
+    return jobs
+
+#argparse type for --tail, reading the last 0 (or fewer) bytes makes no sense
+def _tail_bytes(value):
+    try:
+        nbytes = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if nbytes < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {nbytes}")
+    return nbytes
+
+def main():
+    parser = argparse.ArgumentParser(description = "list unique non-BotPoke IPs in the access log")
+    parser.add_argument("--tail", type = _tail_bytes, metavar = "BYTES", help = "only read the last BYTES of the log")
+    #-j with no number uses every core
+    parser.add_argument("-j", "--jobs", type = _job_count, nargs = "?", const = 0, metavar = "N",
+                        help = "scan the log with N worker processes (all cores if N is left out)")
+    parser.add_argument("--no-cache", action = "store_true", help = "always parse the log instead of reusing saved results")
+    args = parser.parse_args()
 
-    print("Remaining entries (sans BotPoke): ", len(filtered))
+    #--tail results only cover part of the log so they are never cached
+    cache_file = None if args.tail is not None or args.no_cache else _cache_file(LOG_PATH)
+    result = load_cached(cache_file) if cache_file else None
+    if result is None:
+        if args.jobs is not None and args.tail is None:
+            result = extract_ips_parallel(LOG_PATH, args.jobs)
+        else:
+            entries = read_tail(LOG_PATH, args.tail) if args.tail is not None else iter_file(LOG_PATH)
+            result = extract_ips(entries)
+        #nothing read (empty log or a read error) isn't worth caching
+        if cache_file and result[0]:
+            save_cached(cache_file, result)
+    total, remaining, unique_ips = result
+    print("Total initial log entries: ", total)
+    print("Remaining entries (sans BotPoke): ", remaining)
 
-    unique_ips = get_unique_ips(filtered)
     print("\nUnique IP Addresses: ")
     for ip in unique_ips:
-        print(ip)
+        print(ip.decode("ascii"))
 
 if __name__ =="__main__":
     main()
\ No newline at end of file
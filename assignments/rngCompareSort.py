@@ -4,11 +4,25 @@ Description: generate RNG/PRNG lists of numbers and perform different operations
                 to better understand limits and efficiencies
 """
 
+import heapq
 import random
+from array import array
+from bisect import bisect_right
 import secrets
 from collections import Counter
 from time import perf_counter   #more accurate than time.time() and reliable even if comp clock changes time because it can only increase
 
+#numpy's sort and numba (pip install numpy numba) compiling the insertion sort to machine code are extra points
+#of comparison, those extra timings are just skipped when numpy/numba aren't installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 """started with this and realized I wanted something reusable with how many lists would be generated and compared"""
 # #comparing small numbers (1-16)
@@ -18,15 +32,37 @@ from time import perf_counter   #more accurate than time.time() and reliable eve
 # print(randList)
 # #list of 100 random numbers (1-16) using secrets
 
+#n secure random ints in [0, span), same result as calling secrets.randbelow(span) n times but
+#all the random bytes are read from the OS in one go instead of one small read per number
+def secrets_below(span: int, n: int) -> list[int]:
+    """n integers in [0, span) from the OS CSPRNG using one token_bytes() read (rejection sampling keeps it uniform)"""
+    #same error secrets.randbelow gives, otherwise no candidate is ever below span and the loop never ends
+    if span < 1:
+        raise ValueError("Upper bound must be positive.")
+    bits = max(1, (span - 1).bit_length())   #fewest bits that can hold span - 1
+    k = (bits + 7) // 8                       #bytes per candidate number
+    mask = (1 << bits) - 1
+    out = []
+    while len(out) < n:
+        #each candidate is below span more than half the time, so reading 2x what is still needed almost always finishes in one read
+        buf = secrets.token_bytes((n - len(out)) * 2 * k)
+        for i in range(0, len(buf), k):
+            v = int.from_bytes(buf[i:i + k], "big") & mask
+            #candidates past span are thrown away rather than wrapped around with %, which would favor small values
+            if v < span:
+                out.append(v)
+    return out[:n]
+
 #generating random lists using different methods of RNG
 def draw_random(method: str, n: int, low: int, high: int) -> list[int]:
     """return n integers in range low-high using stated RNG method so it can be reused across different size lists"""
     if method == "random":
-        return [random.randint(low, high) for g in range(n)]
+        #one choices() call draws all n at once instead of n separate randint() calls, same Mersenne Twister generator
+        return random.choices(range(low, high + 1), k=n)
     elif method == "secrets":
         #secrets.randbelow is inclusive low, exclusive high; adjust to [low, high] using span
         span = high - low + 1
-        return [low + secrets.randbelow(span) for g in range(n)]
+        return [low + v for v in secrets_below(span, n)]
     else:
         raise ValueError("Method must be 'random' or 'secrets'")
     
@@ -46,32 +82,39 @@ def summarize_counts(nums: list[int]) -> Counter:
 #     return "\n".join(lines)
 
 #get counts of frequency of each value but only show all if range is under a certain threshold, otherwise only show observed values
-def flex_counts(cnt: Counter, low: int, high: int, threshold: int) -> str:
+def flex_counts(cnt: Counter, low: int, high: int, threshold: int, top_k: int | None = None) -> str:
     """
     if range <= threshold then show all values in range with 0s for non-observed values
     if range > threshold then show only observed values with their counts
+    top_k (optional) limits the observed values shown to the k smallest, for big n runs with lots of unique values
     """
     rng_size = high - low + 1
-    lines = []
     if rng_size <= threshold:
-        for v in range(low, high + 1):
-            #f string that formats to show the value of v and right align it using at least 5 character spaces to align neatly in a column
-            #cnt.get looks up the value of v in the Counter dict of freqs and if it is not present returns a 0 instead of an error
-            lines.append(f"{v:>5}: {cnt.get(v, 0)}")
+        #f string that formats to show the value of v and right align it using at least 5 character spaces to align neatly in a column
+        #cnt.get looks up the value of v in the Counter dict of freqs and if it is not present returns a 0 instead of an error
+        #joined straight from a generator, no lines list built up one append at a time
+        return "\n".join(f"{v:>5}: {cnt.get(v, 0)}" for v in range(low, high + 1))
     else:
+        lines = []
         #only keys that actually appear, sorted by value
         #allows for a large range to be used and not show every single value in the range to be listed in the frequency list
-        for v in sorted(cnt.keys()):
-            lines.append(f"{v:>5}: {cnt[v]}")
+        if top_k is None:
+            for v in sorted(cnt.keys()):
+                lines.append(f"{v:>5}: {cnt[v]}")
+        else:
+            #nsmallest only keeps k values around instead of sorting every unique value
+            for v in heapq.nsmallest(top_k, cnt.keys()):
+                lines.append(f"{v:>5}: {cnt[v]}")
+            lines.append(f"...(showing smallest {min(top_k, len(cnt))} of {len(cnt)} observed values)")
         #show how many values in provided range did not appear
         missing = rng_size - len(cnt)
         lines.append(f"...({missing} values in range did not appear)")
     return "\n".join(lines)
 
 #creating an insertion sort - demonstrates sorting degradation over varying sized data sets
-def insertion_sort(a: list[int]) -> list[int]:
-    """ a stable O(n^2) insertion sort that returns a new sorted list"""
-    arr = a[:]  #copy to leave original unmutated 
+def insertion_sort(a: list[int], *, copy: bool = True) -> list[int]:
+    """ a stable O(n^2) insertion sort that returns a new sorted list (or sorts a in place with copy=False)"""
+    arr = a[:] if copy else a  #copy to leave original unmutated 
     for i in range(1, len(arr)):
         key = arr[i]
         j = i - 1
@@ -81,20 +124,92 @@ def insertion_sort(a: list[int]) -> list[int]:
         arr[j + 1] = key
     return arr
 
+#binary insertion sort - same idea but bisect finds each insertion point (O(log n) compares instead of a linear scan)
+#and one slice assignment shifts the block over, both run in C so only the outer loop is python
+#works on an array('q') (plain 64 bit ints side by side in memory) so each shift is a straight memory move,
+#a list would have to move and refcount python int objects (only for ints that fit in 64 bits, fine for these ranges)
+def binary_insertion_sort(a: list[int], *, copy: bool = True) -> list[int]:
+    """ a stable insertion sort that binary searches for each insertion point, returns a new sorted list (or sorts a in place with copy=False)"""
+    arr = array("q", a)
+    for i in range(1, len(arr)):
+        key = arr[i]
+        #bisect_right puts equal values after the ones already placed, keeps it stable
+        pos = bisect_right(arr, key, 0, i)
+        arr[pos + 1:i + 1] = arr[pos:i]
+        arr[pos] = key
+    if copy:
+        return arr.tolist()
+    a[:] = arr
+    return a
+
+#same insertion sort compiled with numba - shows how much of insertion sort's time is python overhead vs the O(n^2) itself
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def insertion_sort_njit(a):
+        """insertion sort on an int64 numpy array, returns a sorted copy"""
+        arr = a.copy()
+        for i in range(1, len(arr)):
+            key = arr[i]
+            j = i - 1
+            while j >= 0 and arr[j] > key:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
+        return arr
+
+    #first call compiles it, done here so compile time never ends up inside a timed call
+    insertion_sort_njit(np.array([2, 1], dtype=np.int64))
+else:
+    insertion_sort_njit = None
+
+def time_njit(data: list[int]) -> float | None:
+    """time the numba insertion sort, list is converted to an array before timing starts. None if numba isn't installed"""
+    if insertion_sort_njit is None:
+        return None
+    return time_call(insertion_sort_njit, np.asarray(data, dtype=np.int64), label="insertion (numba)")
+
 #function that uses .sort()
-def dot_sort(a: list[int]):
-    """sorts list in place using .sort()"""
-    arr = a[:]
+def dot_sort(a: list[int], *, copy: bool = True):
+    """sorts list in place using .sort(), on a copy unless copy=False"""
+    arr = a[:] if copy else a
     arr.sort()
 
+#numpy sorting an int64 array, compares against .sort() which has to compare python int objects
+def np_sort(a):
+    """sorts a copy of a numpy array in place using numpy's sort"""
+    arr = a.copy()
+    arr.sort()
+    return arr
+
+def time_np_sort(data: list[int]) -> float | None:
+    """time np_sort, list is converted to an array before timing starts. None if numpy isn't installed"""
+    if np is None:
+        return None
+    return time_call(np_sort, np.asarray(data, dtype=np.int64), label="numpy sort")
+
+#counting sort - no comparisons at all, just a tally per value then the values written back out in order
+#O(n + k) for k possible values so it only makes sense for a small range like 1-16, not 1-65535
+def counting_sort(a: list[int]) -> list[int]:
+    """returns a new sorted list by counting how many times each value in min(a)-max(a) appears"""
+    if not a:
+        return []
+    lo = min(a)
+    counts = [0] * (max(a) - lo + 1)
+    for x in a:
+        counts[x - lo] += 1
+    out = []
+    for i, c in enumerate(counts):
+        out += [lo + i] * c
+    return out
+
 #timing the sorts
-def time_call(fn, *args, label: str = "") -> float:
+def time_call(fn, *args, label: str = "", **kwargs) -> float:
     """
     timing a single function call and return the elapsed seconds
-    fn = function to be timed, *args allows any number of args to be passed to that function
+    fn = function to be timed, *args/**kwargs allows any arguments to be passed to that function
     """
     t0 = perf_counter()     #records the start time
-    fn(*args)               #call function and arguments
+    fn(*args, **kwargs)     #call function and arguments
     return perf_counter() - t0    #return elapsed time as a float
 
 def compare_sorts(time_insertion: float, time_dot_sort: float) -> None:
@@ -173,13 +288,25 @@ repeats starting to be seen (for funsies changed 'n' to 10000 for one run and sa
 # 3. timing sorting of 100 elements, range 1-16
 #========================
 header("3. Sorting 100 elements, range 1-16")
+#each timed sort gets a fresh copy of the data made before its timer starts (copy=False), so copying the list isn't timed
 data_100_small_num = draw_random("random", n=100, low=1, high=16)
 
-t_insertion_small = time_call(insertion_sort, data_100_small_num, label="insertion")
-t_inplace_small = time_call(dot_sort, data_100_small_num, label=".sort()")
+t_insertion_small = time_call(insertion_sort, list(data_100_small_num), copy=False, label="insertion")
+t_inplace_small = time_call(dot_sort, list(data_100_small_num), copy=False, label=".sort()")
 
 print(f"insertion sort time: {t_insertion_small:.6f} seconds")
 print(f".sort() sort time: {t_inplace_small:.6f} seconds")
+t_binary_small = time_call(binary_insertion_sort, list(data_100_small_num), copy=False, label="binary insertion")
+print(f"binary insertion sort time: {t_binary_small:.6f} seconds")
+#only the small range gets counting sort, its tally list would be 65535 long for the other two
+t_counting_small = time_call(counting_sort, data_100_small_num, label="counting")
+print(f"counting sort time: {t_counting_small:.6f} seconds")
+t_njit_small = time_njit(data_100_small_num)
+if t_njit_small is not None:
+    print(f"numba insertion sort time: {t_njit_small:.6f} seconds")
+t_np_small = time_np_sort(data_100_small_num)
+if t_np_small is not None:
+    print(f"numpy sort time: {t_np_small:.6f} seconds")
 compare_sorts(t_insertion_small, t_inplace_small)
 
 
@@ -189,11 +316,19 @@ compare_sorts(t_insertion_small, t_inplace_small)
 header("4. Sorting 100 elements, range 1-65535")
 data_100_big_num = draw_random("random", n=100, low=1, high=65535)
 
-t_insertion_big = time_call(insertion_sort, data_100_big_num, label="insertion")
-t_inplace_big = time_call(dot_sort, data_100_big_num, label=".sort()")
+t_insertion_big = time_call(insertion_sort, list(data_100_big_num), copy=False, label="insertion")
+t_inplace_big = time_call(dot_sort, list(data_100_big_num), copy=False, label=".sort()")
 
 print(f"insertion sort time: {t_insertion_big:.6f} seconds")
 print(f".sort() sort time: {t_inplace_big:.6f} seconds")
+t_binary_big = time_call(binary_insertion_sort, list(data_100_big_num), copy=False, label="binary insertion")
+print(f"binary insertion sort time: {t_binary_big:.6f} seconds")
+t_njit_big = time_njit(data_100_big_num)
+if t_njit_big is not None:
+    print(f"numba insertion sort time: {t_njit_big:.6f} seconds")
+t_np_big = time_np_sort(data_100_big_num)
+if t_np_big is not None:
+    print(f"numpy sort time: {t_np_big:.6f} seconds")
 compare_sorts(t_insertion_big, t_inplace_big)
 
 #========================
@@ -202,11 +337,19 @@ compare_sorts(t_insertion_big, t_inplace_big)
 header("5. Sorting 500 elements, range 1-65535")
 data_500 = draw_random("random", n=500, low=1, high=65535)
 
-t_insertion_500 = time_call(insertion_sort, data_500, label="insertion")
-t_inplace_500 = time_call(dot_sort, data_500, label=".sort()")
+t_insertion_500 = time_call(insertion_sort, list(data_500), copy=False, label="insertion")
+t_inplace_500 = time_call(dot_sort, list(data_500), copy=False, label=".sort()")
 
 print(f"insertion sort time: {t_insertion_500:.6f} seconds")
 print(f".sort() sort time: {t_inplace_500:.6f} seconds")
+t_binary_500 = time_call(binary_insertion_sort, list(data_500), copy=False, label="binary insertion")
+print(f"binary insertion sort time: {t_binary_500:.6f} seconds")
+t_njit_500 = time_njit(data_500)
+if t_njit_500 is not None:
+    print(f"numba insertion sort time: {t_njit_500:.6f} seconds")
+t_np_500 = time_np_sort(data_500)
+if t_np_500 is not None:
+    print(f"numpy sort time: {t_np_500:.6f} seconds")
 compare_sorts(t_insertion_500, t_inplace_500)
 
 """
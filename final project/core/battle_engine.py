@@ -17,97 +17,192 @@ Description: ui-agnostic battle controller for the overall project
                  hardcoded into the module
 """
 from dataclasses import dataclass, field, replace
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import random
 
 from .models import Monster, Move
 from .damage import compute_damage
 
+class LazyLog:
+    """
+    battle log that stores each message as a format string plus its arguments and only builds
+    the text when the log is read, so headless runs (ai rollouts, simulations) skip the string formatting
+
+    with enabled=False append does nothing at all
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._entries = []
+
+    def append(self, fmt: str, *args) -> None:
+        if self.enabled:
+            self._entries.append((fmt, args))
+
+    @staticmethod
+    def _render(entry) -> str:
+        fmt, args = entry
+        return fmt.format(*args) if args else fmt
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return map(self._render, self._entries)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._render(e) for e in self._entries[i]]
+        return self._render(self._entries[i])
+
 @dataclass
-class BattleState:
+class Side:
     """
-    represents a full multi-pokemon team battle
-    each side has a list of pokemon and an active index
+    one player's half of a battle: their team, hp, moves and which pokemon is active
     """
-    #full teams
-    team_a: List[Monster]
-    team_b: List[Monster]
-    
-    #which pokemon is active
-    active_a: int = 0
-    active_b: int = 0
+    tag: str                    #A or B, also the value stored in BattleState.winner
+    player: str                 #display name used in log messages (eg Player 1)
+    team: List[Monster]
 
-    #hp pools
-    hp_a: List[int] = field(default_factory = list)
-    hp_b: List[int] = field(default_factory = list)
-    
     #move lists per team member (typically 1-4 moves each)
-    moves_a: List[List[Move]] = field(default_factory = list)
-    moves_b: List[List[Move]] = field(default_factory = list)
+    moves: List[List[Move]]
+
+    #hp pool, one entry per team member
+    hp: List[int]
+
+    #which pokemon is active
+    active: int = 0
+
+    #bit i set while team member i still has hp left, so finding the next pokemon to send out doesn't scan the team
+    alive_mask: int = 0
+
+    #move list of the active pokemon, same list object as moves[active]
+    current_moves: List[Move] = field(default_factory = list)
+
+    #move bitmasks for the active pokemon, bit i refers to its move i
+    #set on switch-in and kept up to date as pp is spent so the struggle check doesn't rebuild move lists every turn
+    pp_mask: int = 0        #move still has pp (or unlimited pp)
+    dmg_mask: int = 0       #move deals damage
+
+    @property
+    def monster(self):
+        return self.team[self.active]
+
+@dataclass
+class BattleState:
+    """
+    represents a full multi-pokemon team battle
+    sides[0] is player 1 (A) and sides[1] is player 2 (B), the acting side is picked by index
+    so the engine never has to branch on which player is moving
+    """
+    sides: Tuple[Side, Side]
 
     #turn and flow control
     turn: int = 1
-    next_actor: str = "A"   #A or B to indicate whose turn it is
+    actor: int = 0          #index into sides of whose turn it is, 0 = A, 1 = B
+
+    #False turns logging off entirely for headless battles
+    verbose: bool = True
 
     #text log of events     ("Pikachu used Thunderbolt! It dealt 32 damage.")
-    log: List[str] = field(default_factory = list)
+    log: LazyLog = field(default_factory = LazyLog)
 
     #winner flag of A, B, Draw or None if battle still inprogress
     winner: Optional[str] = None    #A, B, Draw, or None
 
+    def __post_init__(self):
+        #verbose is the one switch for logging, the log itself only checks its enabled flag
+        self.log.enabled = self.verbose
+
+    #per-player views used by the ui
+    @property
+    def next_actor(self):
+        return self.sides[self.actor].tag
+
+    @property
+    def team_a(self):
+        return self.sides[0].team
+
+    @property
+    def team_b(self):
+        return self.sides[1].team
+
+    @property
+    def active_a(self):
+        return self.sides[0].active
+
+    @property
+    def active_b(self):
+        return self.sides[1].active
+
+    @property
+    def hp_a(self):
+        return self.sides[0].hp
+
+    @property
+    def hp_b(self):
+        return self.sides[1].hp
+
+    @property
+    def moves_a(self):
+        return self.sides[0].moves
+
+    @property
+    def moves_b(self):
+        return self.sides[1].moves
+
     @property
     def a(self):
-        return self.team_a[self.active_a]
+        return self.sides[0].monster
     
     @property
     def b(self):
-        return self.team_b[self.active_b]
+        return self.sides[1].monster
     
     @property
     def hp_current_a(self):
-        return self.hp_a[self.active_a]
+        return self.sides[0].hp[self.sides[0].active]
     
     @property
     def hp_current_b(self):
-        return self.hp_b[self.active_b]
+        return self.sides[1].hp[self.sides[1].active]
 
 
-def start_battle(team_a: List[Monster], team_b: List[Monster], moves_a: List[List[Move]], moves_b: List[List[Move]]) -> BattleState:
+def start_battle(team_a: List[Monster], team_b: List[Monster], moves_a: List[List[Move]], moves_b: List[List[Move]], 
+                 verbose: bool = True) -> BattleState:
     """
     initialize a new BattleState for a full team battle
+
+    verbose=False skips all battle log messages (eg simulated battles nobody reads)
     """
     #make shallow copies of moves to keep pp usage isolated to this battle
     moves_a = [[replace(m) for m in mv_list] for mv_list in moves_a]
     moves_b = [[replace(m) for m in mv_list] for mv_list in moves_b]
 
-    state = BattleState(
-        team_a = team_a, 
-        team_b = team_b, 
-        active_a = 0, 
-        active_b = 0, 
-        hp_a = [m.hp for m in team_a], 
-        hp_b = [m.hp for m in team_b], 
-        moves_a = moves_a, 
-        moves_b = moves_b, 
-    )
+    side_a = Side(tag = "A", player = "Player 1", team = team_a, moves = moves_a, 
+                  hp = [m.hp for m in team_a], alive_mask = _alive_mask(team_a))
+    side_b = Side(tag = "B", player = "Player 2", team = team_b, moves = moves_b, 
+                  hp = [m.hp for m in team_b], alive_mask = _alive_mask(team_b))
+    _send_out(side_a, 0)
+    _send_out(side_b, 0)
+    state = BattleState(sides = (side_a, side_b), verbose = verbose)
 
     #simple speed check for first turn
     #decide who acts first based on speed
     if team_a[0].speed > team_b[0].speed:
-        state.next_actor = "A"
+        state.actor = 0
         state.log.append(
-            f"{team_a[0].name} (Player 1) will act first (Speed {team_a[0].speed} vs {team_b[0].speed})."
+            "{} (Player 1) will act first (Speed {} vs {}).", team_a[0].name, team_a[0].speed, team_b[0].speed
         )
     elif team_b[0].speed > team_a[0].speed:
-        state.next_actor = "B"
+        state.actor = 1
         state.log.append(
-            f"{team_b[0].name} (Player 2) will act first (Speed {team_b[0].speed} vs {team_a[0].speed})."
+            "{} (Player 2) will act first (Speed {} vs {}).", team_b[0].name, team_b[0].speed, team_a[0].speed
         )
     else:
         #on speed tie, default to player 1 going first
-        state.next_actor = "A"
+        state.actor = 0
         state.log.append(
-            f"Speeds tie at {team_a[0].speed}. Player 1 acts first."
+            "Speeds tie at {}. Player 1 acts first.", team_a[0].speed
         )
     
     return state
@@ -123,20 +218,72 @@ def _roll_hit(move: Move, rnd: random.Random | None = None) -> bool:
     if move.accuracy is None:
         return True
     
+    #random() * 100 < accuracy hits with the same accuracy/100 chance as randint(1, 100) <= accuracy
+    #without randint's argument checking and integer range math
     r = rnd or random
-    return r.randint(1, 100) <= move.accuracy
+    return r.random() * 100.0 < move.accuracy
 
-def _flip_turn(state, actor_tag):
+def _alive_mask(team: List[Monster]) -> int:
+    """
+    bitmask with bit i set for every team member starting the battle with hp
+    """
+    return sum(1 << i for i, m in enumerate(team) if m.hp > 0)
+
+def _send_out(side: Side, idx: int) -> None:
+    """
+    make team member idx the active pokemon and cache its move list and move masks
+    """
+    side.active = idx
+    moves = side.current_moves = side.moves[idx]
+    side.pp_mask = sum(1 << i for i, m in enumerate(moves) if m.pp is None or m.pp > 0)
+    side.dmg_mask = sum(1 << i for i, m in enumerate(moves) if m.power is not None)
+
+def _first_alive(mask: int) -> Optional[int]:
+    """
+    index of the first team member with hp left, or None if the whole team has fainted
+    """
+    #mask & -mask keeps only the lowest set bit
+    return (mask & -mask).bit_length() - 1 if mask else None
+
+def _handle_ko(state: BattleState, side: Side, winner: Side) -> bool:
+    """
+    side's active pokemon just fainted: send out its next pokemon, or if it has none left
+    declare winner the winner of the battle
+
+    returns True if the battle is over
+    """
+    side.alive_mask &= ~(1 << side.active)
+    next_idx = _first_alive(side.alive_mask)
+    if next_idx is None:
+        state.winner = winner.tag
+        state.log.append("{} wins the battle!", winner.player)
+        return True
+
+    _send_out(side, next_idx)
+    state.log.append("{} was sent out!", side.team[next_idx].name)
+    return False
+
+def _flip_turn(state):
     """
     advances battle flow to the next actor
     """
     #increment turn only after B acts
-    if actor_tag == "B":
+    if state.actor == 1:
         state.turn += 1
 
-    state.next_actor = "B" if actor_tag == "A" else "A"
+    state.actor ^= 1
     return state
 
+def _spend_pp(side: Side, mv: Move, move_index: int) -> None:
+    """
+    use up one pp of the move just used, clearing its pp_mask bit when it runs out
+    """
+    #struggle has pp None so it never reaches here and never clears a bit that isn't its own
+    if mv.pp is not None:
+        mv.pp -= 1
+        if mv.pp <= 0:
+            side.pp_mask &= ~(1 << move_index)
+
 def make_struggle_move():
     """
     simplified Struggle implementation, to aid in battles that would be stalemates for all status moves
@@ -154,6 +301,10 @@ def make_struggle_move():
         effect = "Fallback move when no damaging moves available."
     )
 
+#struggle never changes so every forced struggle shares one instance,
+#pp None (unlimited) means the shared move is never mutated by pp usage
+_STRUGGLE = replace(make_struggle_move(), pp = None)
+
 def apply_move(state: BattleState, move_index: int, rnd: random.Random | None = None) -> BattleState:
     """
     resolve one action for the current actor - A or B
@@ -184,148 +335,68 @@ def apply_move(state: BattleState, move_index: int, rnd: random.Random | None =
     rnd = rnd or random
 
     #identify current actor and defender
-    actor_tag = state.next_actor
-    if actor_tag == "A":
-        actor = state.a
-        defender = state.b
-        # actor_hp = state.hp_a
-        # defender_hp = state.hp_b
-        actor_moves = state.moves_a[state.active_a]
-        # def_team = state.team_b
-        # def_moves = state.moves_b
-    else:
-        actor = state.b
-        defender = state.a
-        # actor_hp = state.hp_b
-        # defender_hp = state.hp_a
-        actor_moves = state.moves_b[state.active_b]
-        # def_team = state.team_a
-        # def_moves = state.moves_a
-
-    #struggle check
-    usable_moves = [m for m in actor_moves if (m.pp is None or m.pp > 0)]
-    usable_damaging = [m for m in usable_moves if m.power is not None]
+    me = state.sides[state.actor]
+    opp = state.sides[state.actor ^ 1]
+    actor = me.monster
+    defender = opp.monster
+    actor_moves = me.current_moves
 
+    #struggle check, no move that both has pp and deals damage
     forced_struggle = False
 
-    if not usable_damaging:
-        mv = make_struggle_move()
+    if not (me.pp_mask & me.dmg_mask):
+        mv = _STRUGGLE
         forced_struggle = True
     else:
         #basic move index validation
         if move_index < 0 or move_index >= len(actor_moves):
-            state.log.append(f"{actor.name} acted but chose an invalid move.")
+            state.log.append("{} acted but chose an invalid move.", actor.name)
             return state
         
         mv = actor_moves[move_index]
 
         #check pp before attempting the move
         if mv.pp is not None and mv.pp <= 0:
-            state.log.append(f"{actor.name} tried {mv.name}, but no PP left!")
+            state.log.append("{} tried {}, but no PP left!", actor.name, mv.name)
             return state
     
     #accuracy roll
     if not _roll_hit(mv, rnd = rnd):
-        state.log.append(f"{actor.name} used {mv.name}, but it missed!")
-        if mv.pp is not None:
-            mv.pp -= 1
-        return _flip_turn(state, actor_tag)
+        state.log.append("{} used {}, but it missed!", actor.name, mv.name)
+        _spend_pp(me, mv, move_index)
+        return _flip_turn(state)
     
 
     #defer to damage.compute_damage for move damage
     dmg = compute_damage(attacker = actor, defender = defender, move = mv)
 
-    #apply damage to correct side
-    if actor_tag == "A":
-        state.hp_b[state.active_b] = max(0, state.hp_b[state.active_b] - dmg)
-        remaining = state.hp_b[state.active_b]
-    else:
-        state.hp_a[state.active_a] = max(0, state.hp_a[state.active_a] - dmg)
-        remaining = state.hp_a[state.active_a]
+    #apply damage to the defending side
+    opp.hp[opp.active] = max(0, opp.hp[opp.active] - dmg)
+    remaining = opp.hp[opp.active]
 
     state.log.append(
-        f"{actor.name} used {mv.name}! It dealt {dmg} damage. "
-        f"{defender.name} has {remaining} HP left."
+        "{} used {}! It dealt {} damage. {} has {} HP left.", 
+        actor.name, mv.name, dmg, defender.name, remaining
     )
 
-    if mv.pp is not None:
-        mv.pp -= 1
+    _spend_pp(me, mv, move_index)
 
     #recoil damage from Struggle implementation
     if forced_struggle:
         recoil = max(1, actor.hp // 4)
-        if actor_tag == "A":
-            state.hp_a[state.active_a] = max(0, state.hp_a[state.active_a] - recoil)
-            state.log.append(f"{actor.name} is hurt by recoil! (-{recoil} HP)")
-        else:
-            state.hp_b[state.active_b] = max(0, state.hp_b[state.active_b] - recoil)
-            state.log.append(f"{actor.name} is hurt by recoil! (-{recoil} HP)")
+        me.hp[me.active] = max(0, me.hp[me.active] - recoil)
+        state.log.append("{} is hurt by recoil! (-{} HP)", actor.name, recoil)
 
     #KO checks  and logic 
     if remaining <= 0:
-        state.log.append(f"{defender.name} fainted!")
-
-        #find next pokemon
-        next_idx = None
-        if actor_tag == "A":
-            #B fainted
-            for i, hp in enumerate(state.hp_b):
-                if hp > 0:
-                    next_idx = i
-                    break
-            if next_idx is None:
-                state.winner = "A"
-                state.log.append("Player 1 wins the battle!")
-                return state
-            else:
-                state.active_b = next_idx
-                state.log.append(f"{state.team_b[next_idx].name} was sent out!")
-        else:
-            #A fainted
-            for i, hp in enumerate(state.hp_a):
-                if hp > 0:
-                    next_idx = i
-                    break
-            if next_idx is None:
-                state.winner = "B"
-                state.log.append("Player 2 wins the battle!")
-                return state
-            else:
-                state.active_a = next_idx
-                state.log.append(f"{state.team_a[next_idx].name} was sent out!")
+        state.log.append("{} fainted!", defender.name)
+        if _handle_ko(state, opp, winner = me):
+            return state
 
     #if Struggle recoil KO'd attacker
-    if forced_struggle:
-        if actor_tag == "A" and state.hp_a[state.active_a] <= 0:
-            state.log.append(f"{actor.name} fainted from recoil!")
-            #switch in next A if possible
-            next_idx = None
-            for i, hp in enumerate(state.hp_a):
-                if hp > 0:
-                    next_idx = i
-                    break
-            if next_idx is None:
-                state.winner = "B"
-                state.log.append("Player 2 wins the battle!")
-                return state
-            else:
-                state.active_a = next_idx
-                state.log.append(f"{state.team_a[next_idx].name} was sent out!")
-
-        elif actor_tag == "B" and state.hp_b[state.active_b] <= 0:
-            state.log.append(f"{actor.name} fainted from recoil!")
-            #switch in next B if possible
-            next_idx = None
-            for i, hp in enumerate(state.hp_b):
-                if hp > 0:
-                    next_idx = i
-                    break
-            if next_idx is None:
-                state.winner = "A"
-                state.log.append("Player 1 wins the battle!")
-                return state
-            else:
-                state.active_b = next_idx
-                state.log.append(f"{state.team_b[next_idx].name} was sent out!")
-
-    return _flip_turn(state, actor_tag)
\ No newline at end of file
+    if forced_struggle and me.hp[me.active] <= 0:
+        state.log.append("{} fainted from recoil!", actor.name)
+        if _handle_ko(state, me, winner = opp):
+            return state
+
+    return _flip_turn(state)
@@ -19,12 +19,48 @@ Description: implements simplified, pokemon-style damage calculations for Gen 1
 """
 
 import json
+import sys
 from pathlib import Path
-from .models import Monster, Move
+from .models import Monster, Move, SPECIAL_TYPES
 import random
 
+#bound once so the per-hit variance roll doesn't look up random.uniform on every call
+_uniform = random.uniform
+
+#numba (pip install numba) compiles the numeric damage kernel to machine code when it is installed,
+#otherwise the kernel just runs as plain python
+try:
+    from numba import njit
+    _jit = njit(cache = True)
+except ImportError:
+    def _jit(func):
+        return func
+
 TYPE_CHART_PATH = Path(__file__).resolve().parents[1] / "data" / "type_chart.json"
-TYPE_CHART: dict[str, dict[str, float]] = json.loads(TYPE_CHART_PATH.read_text(encoding = "utf-8"))
+#type names interned to match the interned types on loaded Monsters/Moves (see json_loaders.py)
+TYPE_CHART: dict[str, dict[str, float]] = {
+    sys.intern(move_type): {sys.intern(t): mult for t, mult in row.items()}
+    for move_type, row in json.loads(TYPE_CHART_PATH.read_text(encoding = "utf-8")).items()
+}
+
+def _chart_multiplier(move_type: str, type_key: tuple) -> float:
+    """combined effectiveness of move_type against a (type1, type2) pair read straight from TYPE_CHART"""
+    mult = 1.0  #if no matching type pairing in type chart, defaults to 1.0 (neutral) effectivness multiplier
+    atk_row = TYPE_CHART.get(move_type, {})
+
+    for t in type_key:
+        if not t:
+            continue
+        mult *= atk_row.get(t, 1.0)
+    return mult
+
+#every (move type -> (type1, type2)) combination in the chart worked out once at import so a hit is a single lookup
+#defender types missing from the chart (eg Steel/Fairy on later-gen typings) are filled in the first time they show up
+_CHART_TYPES = sorted(set(TYPE_CHART) | {t for row in TYPE_CHART.values() for t in row})
+TYPE_MULT: dict[str, dict[tuple, float]] = {
+    move_type: {(t1, t2): _chart_multiplier(move_type, (t1, t2)) for t1 in _CHART_TYPES for t2 in (None, *_CHART_TYPES)}
+    for move_type in TYPE_CHART
+}
 
 #currently minimal chart with the possibility to extend with time pending future goals
 #chart information derived from https://pokemondb.net/type/dual
@@ -61,18 +97,52 @@ def type_multiplier(move_type: str, defender: Monster) -> float:
     - Electric vs (Flying/Ground):
         Electric -> Flying = 2.0, Electric -> Ground = 0.0 -> total = 0.0 (immune)
     """
-    mult = 1.0  #if no matching type pairing in type chart, defaults to 1.0 (neutral) effectivness multiplier
-    atk_row = TYPE_CHART.get(move_type, {})
-
-    for t in (defender.type1, defender.type2):
-        if not t:
-            continue
-        mult *= atk_row.get(t, 1.0)
+    key = defender._type_key
+    row = TYPE_MULT.get(move_type)
+    if row is None:
+        row = TYPE_MULT[move_type] = {}
+    mult = row.get(key)
+    if mult is None:
+        mult = row[key] = _chart_multiplier(move_type, key)
     return mult     #returns the combined effectiveness multiplier, moves can be significantly more or less effective than their baseline
 
 def is_special(move_type: str) -> bool: 
     """returns True for the seven special types of gen1 moves to determine which stats to use"""
-    return move_type in {"Fire", "Water", "Grass", "Electric", "Ice", "Psychic", "Dragon"}
+    return move_type in SPECIAL_TYPES
+
+def _damage_scale(attacker: Monster, defender: Monster, move: Move) -> float:
+    """
+    everything in the damage formula except the random variance roll, 0.0 when the move can't do damage
+    (status move or immune defender)
+    """
+    if move.category == "Status" or move.power is None:
+        return 0.0    #no damage
+    
+    #type-effectiveness
+    eff = type_multiplier(move.type, defender)
+    
+    #ensures immunities are recognized
+    #bails before calculations and other determinations if defender will be immune to damage from hit
+    if eff == 0.0:
+        return 0.0
+        
+    #determine atk/dfn use vs sp_atk/sp_dfn use
+    use_special = move.is_special
+    atk = attacker.sp_atk if use_special else attacker.atk
+    dfn = defender.sp_dfn if use_special else defender.dfn
+
+    #same-type attack bonus
+    stab = 1.5 if move.type in attacker._type_set else 1.0
+
+    return _scale_kernel(move.power, atk, dfn, stab, eff)
+
+@_jit
+def _scale_kernel(power: int, atk: int, dfn: int, stab: float, eff: float) -> float:
+    """pure arithmetic part of the damage formula, only numbers in and out so numba can compile it"""
+    #base damage calc, gen1 formula ((2 * level / 5 + 2) * power * atk / dfn) / 50 + 2 with level fixed at 50
+    #folds to (22 / 50) = 0.44, if level ever becomes variable this constant becomes (2 * level / 5 + 2) / 50
+    base = 0.44 * power * atk / max(1, dfn) + 2.0
+    return base * stab * eff
 
 def compute_damage(attacker: Monster, defender: Monster, move: Move, rng: float | None = None, rnd: random.Random | None = None) -> int:
     """
@@ -92,35 +162,31 @@ def compute_damage(attacker: Monster, defender: Monster, move: Move, rng: float
         -a random variance (~0.85–1.00) simulates Gen 1 damage ranges
         -non-immune hits always deal at least 1 HP of damage
     """
-    if move.category == "Status" or move.power is None:
-        return 0    #no damage
-    
-    #type-effectiveness
-    eff = type_multiplier(move.type, defender)
-    
-    #ensures immunities are recognized
-    #bails before calculations and other determinations if defender will be immune to damage from hit
-    if eff == 0.0:
+    scale = _damage_scale(attacker, defender, move)
+    if scale == 0.0:
         return 0
-        
-    #determine atk/dfn use vs sp_atk/sp_dfn use
-    use_special = is_special(move.type)
-    atk = attacker.sp_atk if use_special else attacker.atk
-    dfn = defender.sp_dfn if use_special else defender.dfn
-
-    #base damage calc
-    base = (((2 * 50 / 5 + 2) * move.power * (atk / max(1, dfn))) / 50) + 2
-
-    #same-type attack bonus
-    stab = 1.5 if move.type in (attacker.type1, attacker.type2) else 1.0
     
     #rolls a random style variance in damage like in gen1 ~.85-1.00
     #gives the same move a range of HP dealt to simulate not every landed strike always being exactly the same
     if rng is None:
-        rng = random.uniform(0.85, 1.00)
+        rng = _uniform(0.85, 1.00)
     
     #final damage calc
-    total = base * stab * eff * rng
+    total = scale * rng
     
     #ensures non-immune hits do at least 1 Hp of damage
-    return max(1, int(total))
\ No newline at end of file
+    return max(1, int(total))
+
+def compute_damage_batch(attacker: Monster, defender: Monster, move: Move, n: int, rnd: random.Random | None = None) -> list[int]:
+    """
+    n independent damage rolls of the same move in the same matchup (eg simulations estimating damage ranges)
+
+    same rules as compute_damage, but the matchup-dependent part of the formula is worked out once
+    and only the random variance is rolled per sample
+    """
+    scale = _damage_scale(attacker, defender, move)
+    if scale == 0.0:
+        return [0] * n
+
+    uniform = (rnd or random).uniform
+    return [max(1, int(scale * uniform(0.85, 1.00))) for _ in range(n)]
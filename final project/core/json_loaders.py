@@ -21,6 +21,7 @@ Description: provides helper functions for loading the projects json data and co
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List
 
@@ -36,6 +37,13 @@ ROOT = Path(__file__).resolve().parents[1]
 #directory where pokeapi_loader.py stores its output json files
 DATA_DIR = ROOT / "data"
 
+def _intern_type(name: str | None) -> str | None:
+    """
+    intern a type name so the type chart/STAB lookups in damage.py can match it by identity,
+    None (no second type) is passed through
+    """
+    return sys.intern(name) if name else name
+
 def load_monsters_json(path: str | None = None) -> Dict[str, Monster]:
     """
     load monsters.json and return a dict mapping from dex id to Monster objects
@@ -66,8 +74,8 @@ def load_monsters_json(path: str | None = None) -> Dict[str, Monster]:
         monsters[dex] = Monster(
             dex = data["dex"], 
             name = data["name"], 
-            type1 = data["type1"], 
-            type2 = data.get("type2"),      #may be None
+            type1 = _intern_type(data["type1"]), 
+            type2 = _intern_type(data.get("type2")),      #may be None
             sprite = data.get("sprite"),    #includes pokeapi sprite url - may be None
             hp = data["hp"], 
             atk = data["atk"], 
@@ -95,7 +103,7 @@ def load_moves_json(path: str | None = None) -> Dict[str, Move]:
     for name, data in raw.items():
         moves[name] = Move(
             name = data["name"], 
-            type = data["type"], 
+            type = _intern_type(data["type"]), 
             power = data["power"], 
             accuracy = data["accuracy"], 
             pp = data["pp"], 
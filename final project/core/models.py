@@ -8,8 +8,12 @@ Description: defines core data structures used througout the project
 from dataclasses import dataclass, field    #field lets you configure how a field behaves when the dataclass is created
 from typing import Optional, List #Optional = built in module for type hints that allows a field to be 'x' or 'None'
 
+#the seven gen1 types whose moves use sp_atk/sp_dfn instead of atk/dfn
+SPECIAL_TYPES = frozenset({"Fire", "Water", "Grass", "Electric", "Ice", "Psychic", "Dragon"})
+
 #importing dataclass and using it here auto-generates __init__, __repr__, __eq__ from the given fields
-@dataclass
+#slots=True stores fields in fixed slots instead of a per-instance __dict__, less memory per object and faster attribute reads
+@dataclass(slots=True)
 class Move:
     """represents a move available in battle"""
     name: str               #display name of the move (eg Hydro Pump)
@@ -19,13 +23,17 @@ class Move:
     pp: int                 #remaining power points for a move in the current battle
     category: str = "Physical"      #Physical/Special (gen1 does not use Status, accuracy is used to determine Status moves not cat) - physical default
     effect: str = ""        #free-form text describing move effects, only used for display/logging purposes (no calculations this version)
+    is_special: bool = field(init=False, repr=False, compare=False)     #uses special stats, a move's type never changes so this is set once
+
+    def __post_init__(self):
+        self.is_special = self.type in SPECIAL_TYPES
 
     #default __repr__ class auto defined by @dataclass is too verbose
     def __repr__(self):
         pow_text = f"<Power: {self.power}>" if self.power is not None else ""       #show power if present otherwise nothing added to line
         return f"<Move: {self.name}, {pow_text}, Type/Cat: ({self.type}/{self.category})>"
 
-@dataclass
+@dataclass(slots=True)
 class Monster:
     """represents a pokemon with base stats and an optional move list"""
     dex: str                #pokedex number, gen1 pokemon, ex. 'No.001'
@@ -40,6 +48,12 @@ class Monster:
     speed: int              #battle stat - speed
     sprite: Optional[str] = None    #url/path for front sprite image
     moves: List[Move] = field(default_factory=list) #calls list() each time a new monster is created with its own empty move list
+    _type_key: tuple = field(init=False, repr=False, compare=False)     #(type1, type2) built once, used as the key into damage.TYPE_MULT
+    _type_set: frozenset = field(init=False, repr=False, compare=False) #this pokemon's types for the STAB check
+
+    def __post_init__(self):
+        self._type_key = (self.type1, self.type2)
+        self._type_set = frozenset(t for t in self._type_key if t)
 
     #default __repr__ class defined by @dataclass is too verbose
     def __repr__(self):
@@ -12,10 +12,23 @@ Description: this script pulls gen1 pokemon dat afrom pokeapi and generates four
                                           using PokeAPI’s official damage_relations
 """
 
+import hashlib
 import json
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+#orjson (pip install orjson) encodes the output files much faster than the json module,
+#use it when it is installed and fall back to the standard library otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 #-----------------------------
 # API configuration
 #-----------------------------
@@ -29,6 +42,20 @@ GEN_ENDPOINT = "generation/1/"
 #filtering out moves used in later generations to keep all moves limited to gen1 legal moves
 VERSION_GROUP = "red-blue"  #only moves from pokemon red/blue
 
+#how many requests can be waiting on pokeapi at once, the run is network bound so threads overlap the waiting
+MAX_WORKERS = 16
+
+#one session shared by every thread so connections to pokeapi are reused instead of reopened per request
+SESSION = requests.Session()
+#the default pool only keeps 10 connections per host, sized to MAX_WORKERS so every thread gets a reusable one
+#rate limiting (429) and server errors are retried with backoff, a request that still fails
+#comes back as the error response so raise_for_status reports it like before
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections = 1, 
+    pool_maxsize = MAX_WORKERS, 
+    max_retries = Retry(total = 5, backoff_factor = 0.3, status_forcelist = [429, 500, 502, 503, 504], raise_on_status = False), 
+))
+
 #-----------------------------
 # output paths
 #-----------------------------
@@ -46,6 +73,14 @@ MOVE_OUT = OUT_DIR / "moves.json"
 LEARN_OUT = OUT_DIR / "move_learners.json"
 TYPE_CHART_OUT = OUT_DIR / "type_chart.json"
 
+#the data files are committed and read by people as well as the app, so they are pretty-printed (indented) by default
+#run with PRETTY=0 to write compact json instead, smaller and quicker to write and load
+PRETTY = os.getenv("PRETTY", "1") == "1"
+
+#raw pokeapi responses are saved here (one json file per url) so re-runs don't download everything again
+#gen1 data on pokeapi doesn't change, delete this folder to force a fresh download
+CACHE_DIR = ROOT / ".cache" / "pokeapi"
+
 #gen1 types used when building type charts for move effectiveness
 GEN1_TYPES = [
     "normal", "fire", "water", "electric", "grass", "ice",
@@ -57,10 +92,42 @@ GEN1_TYPES = [
 def fetch(url: str) -> dict:
     """
     perform a GET request to the given url and return decoded json
+
+    responses are cached on disk under CACHE_DIR keyed by url, only urls not fetched
+    on an earlier run go out over the network
     """
-    resp = requests.get(url, timeout = 15)
+    cache_file = CACHE_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+    try:
+        return json.loads(cache_file.read_text(encoding = "utf-8"))
+    #not cached yet (or a damaged cache file), fall through to the real request
+    except (OSError, ValueError):
+        pass
+
+    resp = SESSION.get(url, timeout = 15)
+    #failed requests raise before anything is cached so they are retried next run
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+
+    CACHE_DIR.mkdir(parents = True, exist_ok = True)
+    cache_file.write_text(json.dumps(data), encoding = "utf-8")
+    return data
+
+def write_json(path: Path, obj) -> None:
+    """
+    write obj to path as json, indented unless PRETTY is turned off
+
+    the json is streamed straight into a buffered file instead of being built up as one big string first
+    """
+    if orjson is not None:
+        #orjson hands back the whole file as bytes in one go, so it is written in one go
+        with open(path, "wb") as out_file:
+            out_file.write(orjson.dumps(obj, option = orjson.OPT_INDENT_2 if PRETTY else 0))
+        return
+
+    #no spaces after separators in compact mode, same output orjson gives
+    fmt = {"indent": 2} if PRETTY else {"separators": (",", ":")}
+    with open(path, "w", encoding = "utf-8", buffering = 1 << 16) as out_file:
+        json.dump(obj, out_file, **fmt)
 
 def get_gen1_species_names() -> list[str]:
     """
@@ -156,6 +223,8 @@ def extract_legal_gen1_moves(pokemon_json: dict) -> dict[str, dict]:
 
 #     return slug 
 
+#same move asked for twice in one run skips the request and the dict building
+@lru_cache(maxsize = None)
 def fetch_move_details(display_name: str, slug: str):
     """
     fetch detailed move data from pokeapi using the exact move slug
@@ -176,6 +245,21 @@ def fetch_move_details(display_name: str, slug: str):
         "pp": data["pp"], 
     }
 
+def _fetch_move_safe(display_name: str, slug: str) -> tuple[str, dict | None]:
+    """
+    fetch_move_details for use in the thread pool, a move that fails is reported and
+    returned as None instead of aborting the whole run
+    """
+    try:
+        return display_name, fetch_move_details(display_name, slug)
+    #gives warning if move does not map properly but will output the rest of the JSON file
+    except requests.HTTPError as e:
+        print(f"!!! FAILED TO FETCH '{display_name}' (slug '{slug}'): {e}")
+    #catch-all to avoid aborting entire run for one bad move
+    except Exception as e:
+        print(f"!!! UNEXPECTED ERROR for move '{display_name}' (slug '{slug}'): {e}")
+    return display_name, None
+
 def fethc_type_resource(type_name: str) -> dict:
     """
     fetch a single type resource from pokeapi (ex fire, water)
@@ -183,9 +267,7 @@ def fethc_type_resource(type_name: str) -> dict:
     use when building the type effectiveness chart
     """
     url = API_BASE + "type/" + type_name + "/"
-    resp = requests.get(url, timeout = 15)
-    resp.raise_for_status()
-    return resp.json()
+    return fetch(url)
 
 def build_type_chart() -> dict[str, dict[str, float]]:
     """
@@ -253,15 +335,14 @@ def main():
     main driver for generating all three json files the rest of the program will rely on
 
     1. fetch gen1 species list
-    2. for each pokemon:
-        -pull detailed pokemon data
+    2. for each pokemon (detailed pokemon data pulled concurrently by a thread pool):
         -extract stats, types, sprite
         -extract legal gen1 level-up moves, with slug and level
         -store pokemon in monsters.json
         -store readable move list for move_learners.json
-        -ensure each move has detailed entry in moves.json
-    3. sort all final dictionaries (dex order for monsters/learners, alphabetical for moves)
-    4. write json output files to the /data directory
+    3. fetch detailed data for every unique move once (concurrently) for moves.json
+    4. sort moves alphabetically (monsters/learners are already built in dex order)
+    5. write json output files to the /data directory
         * monsters.json         - keyed by dex number (e.g., "#001"), with stats/types/sprite
         * moves.json            - keyed by move name (alphabetically sorted)
         * move_learners.json    - mapping each dex number to the list of moves it can learn
@@ -273,68 +354,66 @@ def main():
     monsters: dict[str, dict] = {}
     all_moves: dict[str, dict] = {}
     move_learners: dict[str, list[str]] = {}
+    #every move any species can learn, display name -> slug, so each one is fetched exactly once
+    move_slugs: dict[str, str] = {}
+
+    with ThreadPoolExecutor(max_workers = MAX_WORKERS) as ex:
+        #fetch detailed pokemon data by species name, all species requested concurrently
+        #species names come back alphabetical, ordering the results by dex number here means monsters and
+        #move_learners are filled in dex order and never need re-sorting before they are written
+        pokemon_jsons = ex.map(lambda name: fetch(API_BASE + "pokemon/" + name), species_names)
+        pokemon_jsons = sorted(pokemon_jsons, key = lambda p: p["id"])
+
+        for pokemon_json in pokemon_jsons:
+            #formats the dex number (1-151 for gen1) as #001-#151
+            dex = pokemon_json["id"]
+            dex_str = f"#{dex:03d}"
+
+            #extracts types, stats, and the front sprite url
+            t1, t2 = extract_types(pokemon_json)
+            stats = extract_stats(pokemon_json)
+            sprite = pokemon_json["sprites"]["front_default"]
+
+            #get all legal level-up moves for red/blue
+            legal_moves = extract_legal_gen1_moves(pokemon_json)
+
+            #build the monster entry to be stored in monsters.json
+            monsters[dex_str] = {
+                "dex": dex_str, 
+                "name": pokemon_json["name"].title(), 
+                "type1": t1, 
+                "type2": t2, 
+                "sprite": sprite, 
+                **stats, 
+            }
 
-    for name in species_names:
-        #fetch detailed pokemon data by species name
-        pokemon_json = fetch(API_BASE + "pokemon/" + name)
-
-        #formats the dex number (1-151 for gen1) as #001-#151
-        dex = pokemon_json["id"]
-        dex_str = f"#{dex:03d}"
-
-        #extracts types, stats, and the front sprite url
-        t1, t2 = extract_types(pokemon_json)
-        stats = extract_stats(pokemon_json)
-        sprite = pokemon_json["sprites"]["front_default"]
-
-        #get all legal level-up moves for red/blue
-        legal_moves = extract_legal_gen1_moves(pokemon_json)
-
-        #build the monster entry to be stored in monsters.json
-        monsters[dex_str] = {
-            "dex": dex_str, 
-            "name": pokemon_json["name"].title(), 
-            "type1": t1, 
-            "type2": t2, 
-            "sprite": sprite, 
-            **stats, 
-        }
-
-        #store only the move names for this pokemon in move_learners.json
-        move_learners[dex_str] = sorted(legal_moves.keys())
-
-        #for each move this pokemon can learn, ensure detailed move data
-        for display_name, info in legal_moves.items():
-            slug = info["slug"]
+            #store only the move names for this pokemon in move_learners.json
+            move_learners[dex_str] = sorted(legal_moves.keys())
 
-            if display_name not in all_moves:
-                try:
-                    all_moves[display_name] = fetch_move_details(display_name, slug)
-                #gives warning if move does not map properly but will output the rest of the JSON file
-                except requests.HTTPError as e:
-                    print(f"!!! FAILED TO FETCH '{display_name}' (slug '{slug}'): {e}")
-                #catch-all to avoid aborting entire run for one bad move
-                except Exception as e:
-                    print(f"!!! UNEXPECTED ERROR for move '{display_name}' (slug '{slug}'): {e}")                
+            #remember each move this pokemon can learn so its detailed data gets fetched below
+            for display_name, info in legal_moves.items():
+                move_slugs.setdefault(display_name, info["slug"])
 
-        #insicates progress to user, shows which pokemon have been loaded
-        print(f"Loaded {dex_str} {pokemon_json['name'].title()}")
+            #insicates progress to user, shows which pokemon have been loaded
+            print(f"Loaded {dex_str} {pokemon_json['name'].title()}")
 
-    #sort monsters and move learners json files numerically (dex order rather than alphabetical name order)
-    monsters_sorted = dict(sorted(monsters.items(), key = lambda x: x[0]))
-    learners_sorted = dict(sorted(move_learners.items(), key = lambda x: x[0]))
+        #ensure each move has detailed move data, all unique moves requested concurrently
+        for display_name, details in ex.map(_fetch_move_safe, move_slugs.keys(), move_slugs.values()):
+            if details is not None:
+                all_moves[display_name] = details
 
+    #monsters and move learners are already in dex order (filled in that order above)
     #sort moves json alphabetically
-    moves_sorted = dict(sorted(all_moves.items(), key = lambda x: x[0].lower()))
+    moves_sorted = {name: all_moves[name] for name in sorted(all_moves, key = str.lower)}
 
     #build type chart from pokeapi for gen1 types
     type_chart = build_type_chart()
 
     #write out json files
-    MON_OUT.write_text(json.dumps(monsters_sorted, indent = 2), encoding = "utf-8")
-    MOVE_OUT.write_text(json.dumps(moves_sorted, indent = 2), encoding = "utf-8")
-    LEARN_OUT.write_text(json.dumps(learners_sorted, indent = 2), encoding = "utf-8")
-    TYPE_CHART_OUT.write_text(json.dumps(type_chart, indent = 2), encoding = "utf-8")
+    write_json(MON_OUT, monsters)
+    write_json(MOVE_OUT, moves_sorted)
+    write_json(LEARN_OUT, move_learners)
+    write_json(TYPE_CHART_OUT, type_chart)
 
     #final confirmation to user in terminal 
     print("\nGenerated files: ")
@@ -8,7 +8,7 @@ Description: runs a self-contained battle and saves results
 
 from pathlib import Path
 from typing import Tuple, List
-from src.loaders import load_monsters, load_moves, load_move_learners
+from src.loaders import load_monsters, load_moves, load_move_learners, index_learners_by_dex
 from src.battle import choose_rand_legal_moves, do_battle
 from src.persist import SaveManager
 import random
@@ -38,13 +38,9 @@ def pick_two_rand(monsters_dict: dict) -> Tuple:
     a, b = random.sample(list(monsters_dict.values()), 2)
     return a, b
 
-def count_legal_moves(dex: str, move_learners: dict) -> int:
+def count_legal_moves(dex: str, learners_by_dex: dict) -> int:
     """count how many legal moves a pokemon can learn"""
-    n = 0 
-    for mv, dexes in move_learners.items():
-        if dex in dexes:
-            n += 1
-    return n
+    return len(learners_by_dex.get(dex, ()))
 
 def show_lineup(monster, moves, label: str):
     """print a pokemon's stats and moves chosen for this battle, only displays - does not manipulate the state of anything"""
@@ -54,13 +50,7 @@ def show_lineup(monster, moves, label: str):
     if moves:
         print("  Moves for this battle:")
         for i, m in enumerate(moves, start = 1):
-            pow_txt = "-" if m.power is None else m.power
-            acc_txt = (
-                "∞" if (m.accuracy is None and m.power is not None) #currently only applies to Swift
-                else "-" if m.accuracy is None
-                else m.accuracy
-            )
-            print(f"{i}. {m.name}  [{m.type}/{m.category}]  Pow:{pow_txt}  Acc:{acc_txt}  PP:{m.pp}")
+            print(f"{i}. {m.name}  [{m.type}/{m.category}]  Pow:{m.power_display}  Acc:{m.accuracy_display}  PP:{m.pp}")
 
 #========================
 #main
@@ -73,7 +63,8 @@ def main():
     #load data
     monsters = load_monsters(str(MONSTERS_PATH))
     move_bank = load_moves(str(MOVES_PATH))
-    learners = load_move_learners(str(LEARNERS_PATH))
+    #inverted once here so each pokemon's learnable moves are a dict lookup instead of a scan of every move
+    learners = index_learners_by_dex(load_move_learners(str(LEARNERS_PATH)))
 
     #find a valid pair where both have at least one legal learnable move
     #if EXCLUDE_UNDER_FOUR = True in settings, can exclude pokemon with <3 total learnable moves
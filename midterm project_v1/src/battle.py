@@ -8,28 +8,21 @@ Description: runs a simple turn-based battle between two pokemon
 """
 
 import random
-from dataclasses import replace
+from copy import copy
 from typing import List, Dict, Optional, Callable
 from .models import Monster, Move
 from .damage import compute_damage
 
 MoveChooser = Callable[[Monster, List[Move], int], Optional[Move]]
 
-def choose_rand_legal_moves(dex: str, move_bank: Dict[str, Move], move_learners: Dict[str, List[str]], k: int = 4) -> List[Move]:
+def choose_rand_legal_moves(dex: str, move_bank: Dict[str, Move], learners_by_dex: Dict[str, List[str]], k: int = 4) -> List[Move]:
     """ pick up to k learneable moves for a given pokemon from the allowable move bank"""
-    #filters move names from move_learners.json that include this pokemon
-    legal_names = [mv for mv, dexes in move_learners.items() if dex in dexes and mv in move_bank]
+    #learners_by_dex is move_learners.json inverted once by loaders.index_learners_by_dex, so no scan of every move
+    legal = [move_bank[mv] for mv in learners_by_dex.get(dex, ()) if mv in move_bank]
 
-    #return empty list if no legal moves, dealt with in main.py main() loop
-    if not legal_names:
-        return []   #caller decides what to do if no legal moves for randomly chosen pokemon
-    
-    #shuffles and slices for variation
-    random.shuffle(legal_names)
-    chosen = legal_names[:min(k, len(legal_names))] 
-
-    #provides a legal move bank for a given pokemon
-    return [move_bank[name] for name in chosen]
+    #random sample for variation, only draws k picks instead of shuffling the whole list
+    #returns an empty list if no legal moves, caller decides what to do (dealt with in main.py main() loop)
+    return random.sample(legal, min(k, len(legal)))
 
 def choose_move_random(_: Monster, moves: List[Move], __: int) -> Optional[Move]:
     """computer picks a random move with PP > 0, None if none available and skips turn"""
@@ -47,24 +40,24 @@ def choose_move_user(actor: Monster, moves: List[Move], turn: int) -> Optional[M
     print(f"\n=== Turn {turn}: {actor.name}'s move ===")
     for i, m in enumerate(moves, start = 1):
         tag = "" if m.pp > 0 else "(NO PP)"
-        pow_txt = "-" if m.power is None else str(m.power)
-        acc_txt = (
-            "∞" if (m.accuracy is None and m.power is not None)
-            else "-" if m.accuracy is None
-            else str(m.accuracy)
-        )
-        print(f"{i}. {m.name}  [{m.type}/{m.category}]  Pow:{pow_txt}  Acc:{acc_txt}  PP:{m.pp} {tag}")
+        print(f"{i}. {m.name}  [{m.type}/{m.category}]  Pow:{m.power_display}  Acc:{m.accuracy_display}  PP:{m.pp} {tag}")
+
+    #every input that picks a usable move ('1'-'4' for moves with PP left) mapped straight to its move,
+    #so a normal choice is a single lookup and the checks below only run for anything else (eg '01' or a bad input)
+    legal_inputs = {str(i): m for i, m in enumerate(moves, start = 1) if m.pp > 0}
 
     #user input loop for move selection per turn, validates input and prompts for valid int input if not an int or enter
     while True:
         raw = input("Choose a move by number (press enter for first available): ").strip()
 
+        mv = legal_inputs.get(raw)
+        if mv is not None:
+            return mv
+
         if raw =="":
             #picks first move with available PP when enter is presses instead of int 1-4
-            for m in moves:
-                if m.pp > 0:
-                    return m
-            return None
+            #(there is always one, moves with no PP left at all returned None above)
+            return available[0]
         
         #prompts for int input if anything but an int
         if not raw.isdigit():
@@ -106,8 +99,8 @@ def do_battle(
 
     #shallow copy moves so PP changes do not leak across battles with persistence
     if copy_moves:
-        moves_a = [replace(m) for m in moves_a]
-        moves_b = [replace(m) for m in moves_b]
+        moves_a = [copy(m) for m in moves_a]
+        moves_b = [copy(m) for m in moves_b]
 
     #starting states
     hp_a, hp_b = a.hp, b.hp
@@ -125,14 +118,17 @@ def do_battle(
     print("\n" + msg)
     log.append(msg)
 
+    #determine turn order based on speed, player (A) first on a tie
+    #speed can't change during a battle in this version so the order is worked out once, not every turn
+    #(important to remember for later version implementation plans - move this back into the loop if speed ever changes mid-battle)
+    order = [(a, moves_a, "A", choose_a), (b, moves_b, "B", choose_b)]
+    if b.speed > a.speed:
+        order.reverse()
+
     #turn order
     while hp_a > 0 and hp_b > 0 and turn < 100:
         log.append(f"---Turn {turn} ---")
 
-        #determine turn order based on speed, re-evaluate each turn (important to remember for later version implementation plans)
-        order = [(a, moves_a, "A", choose_a), (b, moves_b, "B", choose_b)]
-        order.sort(key=lambda x: x[0].speed, reverse = True)
-
         #setting up to make sure player's chooser only runs once per turn
         #was getting duplication of moves in move options each turn
         #resets at start of each full new turn
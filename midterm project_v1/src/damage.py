@@ -8,6 +8,7 @@ Description: implements simplified pokemon style damage calculations based on ty
 """
 
 import random
+from typing import List, Optional, Sequence
 from .models import Monster, Move
 
 #currently minimal chart with the possibility to extend with time pending future goals
@@ -35,6 +36,20 @@ TYPE_CHART = {
     ("Ground","Grass"): 0.5, ("Ground","Bug"): 0.5, ("Ground","Flying"): 0.0,
 }
 
+#TYPE_CHART flattened for the hot path: every type named in the chart gets an int id and the multipliers live in
+#one flat list indexed by move_type_id * N_TYPES + defender_type_id, so a lookup is int math instead of building
+#and hashing a (str, str) tuple. types not in the chart at all are always neutral so they don't need an id
+TYPE_IDS = {t: i for i, t in enumerate(sorted({t for pair in TYPE_CHART for t in pair}))}
+N_TYPES = len(TYPE_IDS)
+
+def _flatten_chart() -> List[float]:
+    """builds the flat multiplier list from TYPE_CHART, any pairing not listed stays 1.0"""
+    chart = [1.0] * (N_TYPES * N_TYPES)
+    for (mv_t, def_t), mult in TYPE_CHART.items():
+        chart[TYPE_IDS[mv_t] * N_TYPES + TYPE_IDS[def_t]] = mult
+    return chart
+
+CHART = _flatten_chart()
 
 def type_multiplier(move_type: str, defender: Monster) -> float:
     """
@@ -45,17 +60,27 @@ def type_multiplier(move_type: str, defender: Monster) -> float:
     - Electric vs (Flying/Ground):
         Electric -> Flying = 2.0, Electric -> Ground = 0.0 -> total = 0.0 (immune)
     """
-    mult = 1.0  #if no matching type pairing in type chart, defaults to 1.0 (neutral) effectivness multiplier
+    #if no matching type pairing in type chart, defaults to 1.0 (neutral) effectivness multiplier
+    row = TYPE_IDS.get(move_type, -1)
+    if row < 0:
+        return 1.0
+    row *= N_TYPES
 
-    for t in (defender.type1, defender.type2):
-        if not t:
-            continue
-        mult *= TYPE_CHART.get((move_type, t), 1.0) #multiplies effectiveness/defender type (type1 (always), type2 (if present))
+    #multiplies effectiveness/defender type (type1 (always), type2 (if present))
+    d1 = TYPE_IDS.get(defender.type1, -1)
+    mult = CHART[row + d1] if d1 >= 0 else 1.0
+    if defender.type2:
+        d2 = TYPE_IDS.get(defender.type2, -1)
+        if d2 >= 0:
+            mult *= CHART[row + d2]
     return mult     #returns the combined effectiveness multiplier, moves can be significantly more or less effective than their baseline
 
+#the seven special types of gen1 moves, shared by is_special() and compute_damage_batch()
+SPECIAL_TYPES = frozenset({"Fire", "Water", "Grass", "Electric", "Ice", "Psychic", "Dragon"})
+
 def is_special(move_type: str) -> bool: 
     """returns True for the seven special types of gen1 moves to determine which stats to use"""
-    return move_type in {"Fire", "Water", "Grass", "Electric", "Ice", "Psychic", "Dragon"}
+    return move_type in SPECIAL_TYPES
 
 #ended up more accurate to have accuracy check in do_battle() in battle.py
 # def _hits(move: Move, rnd: random.Random | None = None) -> bool:
@@ -99,8 +124,9 @@ def compute_damage(attacker: Monster, defender: Monster, move: Move, rng: float
     atk = attacker.sp_atk if use_special else attacker.atk
     dfn = defender.sp_dfn if use_special else defender.dfn
 
-    #base damage calc
-    base = (((2 * 50 / 5 + 2) * move.power * (atk / max(1, dfn))) / 50) + 2
+    #base damage calc, gen1 formula ((2 * level / 5 + 2) * power * atk / dfn) / 50 + 2 with level fixed at 50
+    #folds to (22 / 50) = 0.44, if level ever becomes variable this constant becomes (2 * level / 5 + 2) / 50
+    base = 0.44 * move.power * atk / max(1, dfn) + 2.0
 
     #same-type attack bonus
     stab = 1.5 if move.type in (attacker.type1, attacker.type2) else 1.0
@@ -114,4 +140,57 @@ def compute_damage(attacker: Monster, defender: Monster, move: Move, rng: float
     total = base * stab * eff * rng
     
     #ensures non-immune hits do at least 1 Hp of damage
-    return max(1, int(total))
\ No newline at end of file
+    return max(1, int(total))
+
+def compute_damage_batch(
+        attackers: Sequence[Monster], defenders: Sequence[Monster], moves: Sequence[Move],
+        rngs: Optional[Sequence[float]] = None, rnd: random.Random | None = None,
+        ) -> List[int]:
+    """
+    compute_damage for many attacks in one call, attackers[i] uses moves[i] on defenders[i]
+    -useful for simulating battles in bulk or scoring every candidate move at once
+    -rngs gives the variance roll for each attack, when left out one is rolled per damaging attack from rnd (or random)
+    -same results as calling compute_damage on each attack in order with the same rolls
+    """
+    #looked up once for the whole batch instead of once per attack
+    type_ids_get = TYPE_IDS.get
+    chart = CHART
+    uniform = (rnd or random).uniform
+    out: List[int] = []
+    append = out.append
+
+    for i, (attacker, defender, move) in enumerate(zip(attackers, defenders, moves)):
+        power = move.power
+        if move.category == "Status" or power is None:
+            append(0)
+            continue
+
+        mv_type = move.type
+        #same lookup as type_multiplier
+        eff = 1.0
+        row = type_ids_get(mv_type, -1)
+        if row >= 0:
+            row *= N_TYPES
+            d1 = type_ids_get(defender.type1, -1)
+            if d1 >= 0:
+                eff = chart[row + d1]
+            if defender.type2:
+                d2 = type_ids_get(defender.type2, -1)
+                if d2 >= 0:
+                    eff *= chart[row + d2]
+        if eff == 0.0:
+            append(0)
+            continue
+
+        if mv_type in SPECIAL_TYPES:
+            atk, dfn = attacker.sp_atk, defender.sp_dfn
+        else:
+            atk, dfn = attacker.atk, defender.dfn
+
+        #same formula as compute_damage
+        base = 0.44 * power * atk / max(1, dfn) + 2.0
+        stab = 1.5 if mv_type in (attacker.type1, attacker.type2) else 1.0
+        rng = uniform(0.85, 1.00) if rngs is None else rngs[i]
+        append(max(1, int(base * stab * eff * rng)))
+
+    return out
@@ -5,49 +5,58 @@ Description: handles all parsing and loading of data files into usable Python ob
 """
 
 import json
-import re
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple  #for type hints for easier readabilty and understanding expected outputs
 from .models import Move, Monster
+
+#orjson (pip install orjson) parses json several times faster than the json module,
+#use it when it is installed and fall back to the standard library otherwise
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
  
 #========================
-#regex for parsing text-based data from the data folder for monsters and moves
+#field layouts of the text-based data files in the data folder for monsters and moves
+#each line is 'Key: value' pairs separated by '|' in a fixed order, so lines are split instead of run through a regex
 #========================
 
-#matches lines like: "Monster: #004 ..." (hash style)
-#Monster: #004 Charmander | Type: Fire | HP: 39 | ATK: 52 | DEF: 43 | SP.ATK: 60 | SP.DEF: 50 | SPD: 65
-CRE_RE_NUM = re.compile(
-    r"^Monster:\s*#(?P<dex>\d{3})\s+(?P<name>[^|]+)\s*\|\s*Type:\s*(?P<types>[^|]+)\s*\|"
-    r"\s*HP:\s*(?P<hp>\d+)\s*\|\s*ATK:\s*(?P<atk>\d+)\s*\|\s*DEF:\s*(?P<dfn>\d+)\s*\|"
-    r"\s*SP\.ATK:\s*(?P<spa>\d+)\s*\|\s*SP\.DEF:\s*(?P<spd>\d+)\s*\|\s*SPD:\s*(?P<spe>\d+)\s*$"
-)
-
-#matches line like: "Monster: No.004 ..." (No. style)
-#Monster: No.004 Charmander | Type: Fire | HP: 39 | ATK: 52 | ... (same as above example)
-#the two compiled regexes are OR'd together when matching
-CRE_RE_NO = re.compile(
-    r"^Monster:\s*No\.(?P<dex>\d{3})\s+(?P<name>[^|]+)\s*\|\s*Type:\s*(?P<types>[^|]+)\s*\|"
-    r"\s*HP:\s*(?P<hp>\d+)\s*\|\s*ATK:\s*(?P<atk>\d+)\s*\|\s*DEF:\s*(?P<dfn>\d+)\s*\|"
-    r"\s*SP\.ATK:\s*(?P<spa>\d+)\s*\|\s*SP\.DEF:\s*(?P<spd>\d+)\s*\|\s*SPD:\s*(?P<spe>\d+)\s*$"
-)
-
-#matches lines like:
+#Monster: No.004 Charmander | Type: Fire | HP: 39 | ATK: 52 | DEF: 43 | SP.ATK: 60 | SP.DEF: 50 | SPD: 65
+#(the dex number can also be written hash style: "Monster: #004 ...")
+MONSTER_FIELDS = 8
+
 #Move: Ember | Type: Fire | Cat: Special | Power: 40 | Acc: 100 | PP: 25 | Effect: May burn target.
-MOVE_RE = re.compile(
-    r"^Move:\s*(?P<name>[^|]+)\|\s*Type:\s*(?P<type>[^|]+)\|\s*Cat:\s*(?P<cat>[^|]+)\|"
-    r"\s*Power:\s*(?P<power>[^|]+)\|\s*Acc:\s*(?P<acc>[^|]+)\|\s*PP:\s*(?P<pp>[^|]+)\|\s*Effect:\s*(?P<effect>.+)$"
-)
+MOVE_FIELDS = 7
 
 #========================
 #helper functions (only used in this module)
 #leading '_' denotes that it is only meant to be used in this module and not be called by other modules
 #========================
 
+def _split_fields(line: str, n: int) -> Optional[List[str]]:
+    """
+    split a 'Key: value | Key: value ...' line into its n stripped values, in file order
+    returns None if the line doesn't have n non-empty fields (unknown line format)
+    """
+    #maxsplit keeps any '|' inside the last field (eg effect text) as part of that field
+    parts = line.split("|", n - 1)
+    if len(parts) != n:
+        return None
+    #keys are fixed by the file format so only the text after each 'Key:' is kept
+    values = [part.partition(":")[2].strip() for part in parts]
+    return values if all(values) else None
+
+#the data files only use a few dozen distinct type/power/accuracy strings, so the small helpers below
+#are cached and repeat values skip the string cleanup (type names also come back as one shared string)
+@lru_cache(maxsize = 32)
 def _split_types(s: str) -> Tuple[str, Optional[str]]:   #returns at least one type for every pokemon
     """splits a type string like 'grass/poison' -> ('grass', 'poison')"""
     parts = [p.strip() for p in s.split("/")]
     return (parts[0], parts[1]) if len(parts) > 1 else (parts[0], None)
 
 #unicode dashes were causing errors
+@lru_cache(maxsize = 256)
 def _opt_int(s: str):
     """
     Return int(s) if s is digits; otherwise None (handles '—', '–', '-', '').
@@ -57,6 +66,7 @@ def _opt_int(s: str):
     return int(s) if s.isdigit() else None
 
 #needed to be able to parse the infinity symbol in acc which is not used in power
+@lru_cache(maxsize = 128)
 def _opt_acc(s: str):
     """
     return None for always hit moves ('—', '–', '-', '', '∞'), else an int percent
@@ -83,27 +93,44 @@ def load_monsters(path: str) -> Dict[str, Monster]:
             if not line or line.startswith("#"):
                 continue
 
-            m = CRE_RE_NUM.match(line) or CRE_RE_NO.match(line)
+            fields = _split_fields(line, MONSTER_FIELDS) if line.startswith("Monster:") else None
 
             #ignores and skips unknown line format instead of raising error
-            if not m:
+            if fields is None:
                 continue
 
-            g = m.groupdict()
-            t1, t2 = _split_types(g["types"])
-            dex = f"#{g['dex']}"
+            head, types, *stats = fields
+
+            #head is the dex number and name, eg 'No.004 Charmander' or '#004 Charmander'
+            if head.startswith("No."):
+                head = head[3:]
+            elif head.startswith("#"):
+                head = head[1:]
+            else:
+                continue
+            num, _, name = head.partition(" ")
+            if len(num) != 3 or not num.isdigit() or not name:
+                continue
+            try:
+                hp, atk, dfn, spa, spd, spe = map(int, stats)
+            #non-numeric stat, unknown line format
+            except ValueError:
+                continue
+
+            t1, t2 = _split_types(types)
+            dex = f"#{num}"
 
             monsters[dex] = Monster(
                 dex = dex, 
-                name = g["name"].strip(), 
+                name = name.strip(), 
                 type1 = t1, 
                 type2 = t2, 
-                hp = int(g["hp"]), 
-                atk = int(g["atk"]), 
-                dfn = int(g["dfn"]), 
-                sp_atk = int(g["spa"]), 
-                sp_dfn = int(g["spd"]), 
-                speed = int(g["spe"]), 
+                hp = hp, 
+                atk = atk, 
+                dfn = dfn, 
+                sp_atk = spa, 
+                sp_dfn = spd, 
+                speed = spe, 
             )
 
     return monsters
@@ -119,48 +146,41 @@ def load_moves(path: str) -> Dict[str, Move]:
             if not line or line.startswith("#"):
                 continue
 
-            m = MOVE_RE.match(line)
+            fields = _split_fields(line, MOVE_FIELDS) if line.startswith("Move:") else None
 
             #ignores and skips unknown line format instead of raising error
-            if not m:
+            if fields is None:
                 continue
 
-            #iterates over dict pairs and removes leading and trailing spaces 
-            # (leaves internal spaces) to create a cleaned dictionary 
-            #{
-            # "name": "Ember",
-            # "type": "Fire",
-            # "cat": "Special",
-            # "power": "40",
-            # "acc": "100",
-            # "pp": "25",
-            # "effect": "May burn target."
-            #}
-            g = {k: v.strip() for k, v in m.groupdict().items()}
-
-            power = _opt_int(g["power"])    #must be digits (int) - now handles all forms of dashes properly as None values
-            acc = _opt_acc(g["acc"])        #must be digits (int) - now handles all forms of dashes properly and the infinity symbol
+            #values come back already stripped of leading and trailing spaces
+            # (internal spaces kept) in file order, eg
+            #["Ember", "Fire", "Special", "40", "100", "25", "May burn target."]
+            name, mv_type, cat, power_txt, acc_txt, pp_txt, effect = fields
+
+            power = _opt_int(power_txt)    #must be digits (int) - now handles all forms of dashes properly as None values
+            acc = _opt_acc(acc_txt)         #must be digits (int) - now handles all forms of dashes properly and the infinity symbol
 
             #power = None if g["power"] in ("-", "") else int(g["power"])
             #acc = None if g["acc"] in ("-", "") else int(g["acc"])
-            pp = int(g["pp"]) if g["pp"].isdigit() else 0   #must be digits, otherwise 0
+            pp = int(pp_txt) if pp_txt.isdigit() else 0   #must be digits, otherwise 0
 
-            moves[g["name"]] = Move(
-                name = g["name"], 
-                type = g["type"], 
-                category = g["cat"], 
+            moves[name] = Move(
+                name = name, 
+                type = mv_type, 
+                category = cat, 
                 power = power, 
                 accuracy = acc, 
                 pp = pp, 
-                effect = g["effect"], 
+                effect = effect, 
             )
 
     return moves
 
 def load_move_learners(path: str) -> Dict[str, List[str]]:
     """parse move_learners.json -> dict of {move_name: ['#004', '#007', ...]}"""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    #read as bytes, orjson only takes bytes and json.loads accepts them too
+    with open(path, "rb") as f:
+        data = _json_loads(f.read())
 
     normalized: Dict[str, List[str]] = {}
 
@@ -171,6 +191,21 @@ def load_move_learners(path: str) -> Dict[str, List[str]]:
             s = str(d).strip()
             fixed.append(s if s.startswith("#") else "#" + s.zfill(3))
         #deduped, numeric sort by the int portion of #NNN
-        normalized[mv] = sorted(set(fixed), key=lambda x: int(x[1:]))
-
-    return normalized
\ No newline at end of file
+        #the generated file already lists each move's dex numbers in order with no repeats, so a
+        #single pass checking that is enough and the list is kept as is instead of being re-sorted
+        nums = [int(x[1:]) for x in fixed]
+        if all(a < b for a, b in zip(nums, nums[1:])):
+            normalized[mv] = fixed
+        else:
+            normalized[mv] = [x for _, x in sorted({(int(x[1:]), x) for x in fixed})]
+
+    return normalized
+
+def index_learners_by_dex(move_learners: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """invert {move_name: [dex, ...]} -> {dex: [move_name, ...]} so a pokemon's learnable moves are one dict lookup"""
+    by_dex: Dict[str, List[str]] = defaultdict(list)
+    for mv, dexes in move_learners.items():
+        for d in dexes:
+            by_dex[d].append(mv)
+    #plain dict so looking up a dex with no moves doesn't add an empty entry
+    return dict(by_dex)
@@ -9,7 +9,10 @@ from dataclasses import dataclass, field    #field lets you configure how a fiel
 from typing import Optional, List #Optional = built in module for type hints that allows a field to be 'x' or 'None'
 
 #importing dataclass and using it here auto-generates __init__, __repr__, __eq__ from the given fields
-@dataclass
+#slots=True gives each instance fixed attribute slots instead of a __dict__, so instances take less memory
+#and attribute reads (eg attacker.atk in compute_damage) go straight to the slot
+#Move stays mutable since do_battle counts down pp on its per-battle copies
+@dataclass(slots = True)
 class Move:
     """represents a move available in battle"""
     name: str               #disply name of the move (eg Hydro Pump)
@@ -20,12 +23,31 @@ class Move:
     pp: int                 #remaining power points for a move in the current battle
     effect: str             #free-form text describing move effects, only used for display/logging purposes (no calculations this version)
 
+    #menu text for power/accuracy, worked out once when the move is made instead of every time a move menu is shown
+    #not constructor arguments and left out of __repr__/__eq__, they only ever follow power and accuracy
+    power_display: str = field(init = False, repr = False, compare = False)
+    accuracy_display: str = field(init = False, repr = False, compare = False)
+
+    def __post_init__(self):
+        self.power_display = "-" if self.power is None else str(self.power)
+        self.accuracy_display = (
+            "∞" if (self.accuracy is None and self.power is not None)   #currently only applies to Swift
+            else "-" if self.accuracy is None
+            else str(self.accuracy)
+        )
+
+    #copy.copy(move) is used for the per-battle move copies in do_battle, passing the fields straight
+    #to the constructor is much quicker than dataclasses.replace() which rebuilds them as keyword arguments
+    def __copy__(self):
+        return Move(self.name, self.type, self.category, self.power, self.accuracy, self.pp, self.effect)
+
     #default __repr__ class auto defined by @dataclass is too verbose
     def __repr__(self):
         pow_text = f"<Power: {self.power}>" if self.power is not None else ""       #show power if present otherwise nothing added to line
         return f"<Move: {self.name}, {pow_text}, Type/Cat: ({self.type}/{self.category})>"
 
-@dataclass
+#monsters are never changed after loading (battle hp is tracked in do_battle), so they are also frozen
+@dataclass(slots = True, frozen = True)
 class Monster:
     """represents a pokemon with nase stats and an optional move list"""
     dex: str                #pokedex number, gen1 pokemon, ex. 'No.001'
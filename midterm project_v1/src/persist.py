@@ -11,6 +11,24 @@ import json, time
 from pathlib import Path
 from typing import Dict, List, Optional
 
+#orjson (pip install orjson) encodes json several times faster than the json module,
+#use it when it is installed and fall back to the standard library otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dump_json(obj) -> bytes:
+    """indented utf-8 json (non-ascii characters kept as is) as bytes, written to disk in one go"""
+    if orjson is not None:
+        #orjson refuses things the json module handles (non-str dict keys, ints over 64 bits),
+        #those states are written by the json module instead of failing the save
+        try:
+            return orjson.dumps(obj, option = orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii = False, indent = 2).encode("utf-8")
+
 class SaveManager:
     """
     makes and manages two subfolders: <root>/saves/slots , <root>/saves/battles
@@ -34,8 +52,7 @@ class SaveManager:
     def save_slot(self, slot_name: str, state: Dict) -> Path:
         """writes a json snapshot of any dictionary state"""
         p = self.slots_dir / f"{slot_name}.json"
-        with p.open("w", encoding = "utf-8") as f:
-            json.dump(state, f, ensure_ascii = False, indent = 2)
+        p.write_bytes(_dump_json(state))
         return p
     
     def load_slot(self, slot_name: str) -> Optional[Dict]:
@@ -67,8 +84,7 @@ class SaveManager:
         log_path = self.battles_dir / f"{base}.log"
 
         #structured json for post analysis
-        with json_path.open("w", encoding = "utf-8") as f:
-            json.dump({"meta": meta, "events": events, "log": lines}, f, ensure_ascii = False, indent = 2)
+        json_path.write_bytes(_dump_json({"meta": meta, "events": events, "log": lines}))
 
         #human readable log for easy checking
         with log_path.open("w", encoding = "utf-8") as f:
@@ -78,10 +94,12 @@ class SaveManager:
     
     def rotate_battles(self, keep_last: int = 200):
         """keeps only the most recent keep_last battle logs (json + .log), deletes older ones"""
-        items = sorted(self.battles_dir.glob("*.json"))
+        items = list(self.battles_dir.glob("*.json"))
         if len(items) <= keep_last:
             return
         
+        #only sorted once there is actually something to delete, timestamped names sort oldest first
+        items.sort()
         to_remove = items[0: len(items) - keep_last]
 
         #removing excess logs